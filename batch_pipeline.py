@@ -0,0 +1,371 @@
+# batch_pipeline.py
+"""
+Generate roadmaps for many resumes without the Streamlit UI.
+
+Each resume goes through parse -> goal analysis -> skill matching -> roadmap
+generation. Parsing (PyMuPDF/Tesseract) runs in a process pool; Gemini calls
+run concurrently under --concurrency and the shared client's rate limit
+(SKILLWISE_GEMINI_CONCURRENCY, SKILLWISE_GEMINI_RPM). Results are appended
+to a JSONL file as they finish, and finished ids are recorded in a
+checkpoint file so an interrupted run picks up where it stopped. Failed
+resumes are written with an "error" and retried on the next run.
+
+Near-duplicate resumes (re-submissions, lightly edited copies) are detected
+with a persistent MinHash/LSH index (resume_dedup.py, SKILLWISE_DEDUP_INDEX).
+With ``--dedup reuse`` (the default), a resume that nearly matches one already
+processed for the same role and goal reuses its roadmap instead of calling
+Gemini. With ``--dedup flag``, the match is recorded but the roadmap is still
+generated. Either way the record carries ``duplicate_of``.
+
+    python batch_pipeline.py resumes/ --role "Data Scientist" --goal "Move into ML" --out results.jsonl
+    python batch_pipeline.py manifest.csv --out results.jsonl --workers 4 --concurrency 8
+
+A manifest is a CSV or JSONL file with ``path``, ``role`` and ``goal``
+(optional ``id``); relative paths are resolved against the manifest. A row's
+id defaults to its resolved path; rows that repeat a path need an explicit id.
+"""
+import argparse
+import asyncio
+import csv
+import json
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional
+
+PARSE_WORKERS = int(os.getenv("SKILLWISE_PARSE_WORKERS", os.cpu_count() or 1))
+LLM_CONCURRENCY = int(os.getenv("SKILLWISE_BATCH_CONCURRENCY", "4"))
+STAGES = ("parse", "analyze", "match", "dedup", "generate")
+DEDUP_MODES = ("reuse", "flag", "off")
+
+
+def load_jobs(source: str, role: Optional[str] = None, goal: Optional[str] = None) -> List[dict]:
+    """
+    Jobs from a directory of PDFs (all with ``role`` and ``goal``) or from a
+    CSV/JSONL manifest. Each job has ``id``, ``path``, ``role`` and ``goal``.
+    """
+    if os.path.isdir(source):
+        if not role:
+            raise ValueError("--role is required when the input is a directory")
+        jobs = []
+        for root, _, names in os.walk(source):
+            for name in sorted(names):
+                if name.lower().endswith(".pdf"):
+                    path = os.path.join(root, name)
+                    jobs.append({"id": os.path.relpath(path, source), "path": path, "role": role, "goal": goal or ""})
+        return sorted(jobs, key=lambda job: job["id"])
+
+    base_dir = os.path.dirname(os.path.abspath(source))
+    with open(source, "r", encoding="utf-8", newline="") as f:
+        if source.lower().endswith(".csv"):
+            rows = list(csv.DictReader(f))
+        else:
+            rows = [json.loads(line) for line in f if line.strip()]
+    paths = []
+    for row_num, row in enumerate(rows, start=1):
+        if not row.get("path"):
+            raise ValueError(f"Manifest row {row_num} has no path")
+        paths.append(os.path.abspath(os.path.join(base_dir, row["path"])))
+    path_counts = Counter(paths)
+    jobs = []
+    for row_num, (row, path) in enumerate(zip(rows, paths), start=1):
+        job_role = row.get("role") or role
+        if not job_role:
+            raise ValueError(f"Manifest row {row_num} has no role and no --role default was given")
+        # Ids default to the resolved path so checkpoints survive edits and reordering of the manifest
+        if not row.get("id") and path_counts[path] > 1:
+            raise ValueError(f"Manifest row {row_num}: {row['path']} appears more than once, so every such row needs an id")
+        jobs.append({
+            "id": str(row.get("id") or path),
+            "path": path,
+            "role": job_role,
+            "goal": row.get("goal") or goal or "",
+        })
+    return jobs
+
+
+def read_checkpoint(path: str) -> set:
+    """Ids of jobs finished by a previous run."""
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            return {line.rstrip("\n") for line in f if line.strip()}
+    except FileNotFoundError:
+        return set()
+
+
+def _parse_worker(path: str) -> dict:
+    from resume_parser import ingest_resume
+
+    start = time.perf_counter()
+    with open(path, "rb") as f:
+        result = ingest_resume(f, sections=True)
+    result["parse_seconds"] = time.perf_counter() - start
+    return result
+
+
+class StageStats:
+    """Per-stage item counts, busy time and wall-clock span."""
+
+    def __init__(self):
+        self.stages: Dict[str, dict] = {name: {"items": 0, "busy": 0.0, "first": None, "last": None} for name in STAGES}
+
+    def record(self, stage: str, started: float, seconds: Optional[float] = None) -> None:
+        ended = time.perf_counter()
+        entry = self.stages[stage]
+        entry["items"] += 1
+        entry["busy"] += ended - started if seconds is None else seconds
+        entry["first"] = started if entry["first"] is None else min(entry["first"], started)
+        entry["last"] = ended if entry["last"] is None else max(entry["last"], ended)
+
+    def summary(self) -> Dict[str, dict]:
+        result = {}
+        for name, entry in self.stages.items():
+            span = (entry["last"] - entry["first"]) if entry["items"] else 0.0
+            result[name] = {
+                "items": entry["items"],
+                "busy_seconds": round(entry["busy"], 3),
+                "items_per_second": round(entry["items"] / span, 2) if span > 0 else None,
+            }
+        return result
+
+
+class BatchPipeline:
+    def __init__(self, out_path: str, checkpoint_path: Optional[str] = None, workers: int = PARSE_WORKERS,
+                 concurrency: int = LLM_CONCURRENCY, regenerate: bool = False, max_retries: int = 3,
+                 dedup: str = "reuse", dedup_index: Optional[str] = None, dedup_threshold: Optional[float] = None):
+        if dedup not in DEDUP_MODES:
+            raise ValueError(f"dedup must be one of {', '.join(DEDUP_MODES)}")
+        self.out_path = out_path
+        self.checkpoint_path = checkpoint_path or out_path + ".checkpoint"
+        self.workers = max(1, workers)
+        self.concurrency = max(1, concurrency)
+        self.regenerate = regenerate
+        self.max_retries = max_retries
+        self.stats = StageStats()
+        self.counts = {"done": 0, "failed": 0, "skipped": 0, "cached": 0, "duplicates": 0, "reused": 0}
+        self.dedup = dedup
+        self.dedup_threshold = dedup_threshold
+        self.index = None
+        if dedup != "off":
+            from resume_dedup import get_resume_index
+
+            self.index = get_resume_index(dedup_index)
+        # Roadmaps being generated in this run, keyed by cache key, so near-duplicates
+        # that arrive while the original is still at Gemini wait for it
+        self._pending: Dict[str, asyncio.Future] = {}
+
+    def _write(self, out, checkpoint, record: dict) -> None:
+        out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        out.flush()
+        if record["status"] == "ok":
+            # Checkpoint only after the result line is written
+            checkpoint.write(record["id"] + "\n")
+            checkpoint.flush()
+
+    def _find_duplicate(self, job: dict, cache_key: str, signature):
+        """Best indexed near-duplicate processed for the same role and goal, or None."""
+        def same_target(match) -> bool:
+            payload = match.payload
+            return (
+                match.id != cache_key
+                and payload.get("role", "").strip().lower() == job["role"].strip().lower()
+                and " ".join(payload.get("goal", "").lower().split()) == " ".join(job["goal"].lower().split())
+            )
+
+        matches = self.index.query(signature, threshold=self.dedup_threshold, limit=1, accept=same_target)
+        return matches[0] if matches else None
+
+    async def _reuse(self, match) -> Optional[str]:
+        """The roadmap produced for ``match``, waiting for it if it is still being generated."""
+        from roadmap_generator import get_cached_roadmap
+
+        pending = self._pending.get(match.id)
+        if pending is not None:
+            return await asyncio.shield(pending)
+        return get_cached_roadmap(match.payload.get("cache_key", match.id))
+
+    async def _process(self, job: dict, pool, parse_slots, llm_slots, out, checkpoint) -> None:
+        from goal_analyzer import analyze_goals
+        from roadmap_generator import (
+            build_roadmap_prompt, cache_roadmap, generate_roadmap_async, get_cached_roadmap, roadmap_cache_key,
+        )
+        from resume_dedup import minhash
+        from resume_sections import ResumeSections
+        from role_fit import get_role_fit_engine
+        from skill_catalog import get_catalog
+
+        record = {"id": job["id"], "path": job["path"], "role": job["role"], "goal": job["goal"]}
+        loop = asyncio.get_running_loop()
+        try:
+            async with parse_slots:
+                started = time.perf_counter()
+                parsed = await loop.run_in_executor(pool, _parse_worker, job["path"])
+            self.stats.record("parse", started, parsed["parse_seconds"])
+            resume_text = parsed["text"]
+            record["pages"] = parsed.get("page_count")
+            record["ocr_pages"] = parsed.get("ocr_pages", [])
+            record["truncated"] = parsed.get("truncated", False)
+
+            started = time.perf_counter()
+            record["goal_analysis"] = analyze_goals(job["goal"]) if job["goal"].strip() else ""
+            self.stats.record("analyze", started)
+
+            started = time.perf_counter()
+            catalog = get_catalog()
+            sections = ResumeSections.from_dict(parsed.get("sections"))
+            skill_text = resume_text
+            if "skills" in sections:
+                skill_text = sections.text_for("summary", "skills", "experience", "projects", "certifications")
+            found = catalog.matcher.matched_skills(skill_text)
+            weighted = catalog.role_skills(job["role"])
+            total_weight = sum(weight for _, weight in weighted) or 1.0
+            record["matched_skills"] = [skill for skill, _ in weighted if skill in found]
+            record["missing_skills"] = [skill for skill, _ in weighted if skill not in found]
+            record["skill_match_score"] = round(sum(weight for skill, weight in weighted if skill in found) / total_weight * 100, 1)
+            record["best_fit_roles"] = get_role_fit_engine(catalog).top_roles_batch([found], k=3)[0]
+            self.stats.record("match", started)
+
+            cache_key = roadmap_cache_key(job["role"], job["goal"], resume_text)
+            roadmap = None if self.regenerate else get_cached_roadmap(cache_key)
+            if not roadmap and cache_key in self._pending:
+                # The same resume, role and goal is already being generated in this run
+                roadmap = await asyncio.shield(self._pending[cache_key])
+            record["cached"] = bool(roadmap)
+            if roadmap:
+                self.counts["cached"] += 1
+            elif self.index is not None:
+                started = time.perf_counter()
+                signature = minhash(resume_text)
+                match = self._find_duplicate(job, cache_key, signature)
+                self.stats.record("dedup", started)
+                if match is not None:
+                    record["duplicate_of"] = {"id": match.payload.get("job_id", match.id), "similarity": round(match.similarity, 3)}
+                    self.counts["duplicates"] += 1
+                    if self.dedup == "reuse" and not self.regenerate:
+                        roadmap = await self._reuse(match)
+                record["reused"] = bool(roadmap)
+                if roadmap:
+                    self.counts["reused"] += 1
+                else:
+                    # Index before generating so near-duplicates later in this run find it
+                    self.index.add(cache_key, signature, {
+                        "job_id": job["id"], "role": job["role"], "goal": job["goal"], "cache_key": cache_key,
+                    })
+            if not roadmap:
+                pending = self._pending[cache_key] = loop.create_future()
+                generation = {}
+                try:
+                    async with llm_slots:
+                        started = time.perf_counter()
+                        roadmap = await generate_roadmap_async(
+                            build_roadmap_prompt(job["role"], job["goal"]), max_retries=self.max_retries, stats=generation,
+                        )
+                        self.stats.record("generate", started)
+                    cache_roadmap(cache_key, roadmap, generation.get("model"))
+                except BaseException:
+                    if self.index is not None:
+                        self.index.remove(cache_key)
+                    raise
+                finally:
+                    pending.set_result(roadmap)
+                    if self._pending.get(cache_key) is pending:
+                        del self._pending[cache_key]
+            record["roadmap"] = roadmap
+            record["status"] = "ok"
+            self.counts["done"] += 1
+        except Exception as e:
+            record["status"] = "error"
+            record["error"] = str(e)
+            self.counts["failed"] += 1
+        self._write(out, checkpoint, record)
+
+    async def run_async(self, jobs: List[dict]) -> dict:
+        finished = read_checkpoint(self.checkpoint_path)
+        todo = [job for job in jobs if job["id"] not in finished]
+        self.counts["skipped"] = len(jobs) - len(todo)
+        parse_slots = asyncio.Semaphore(self.workers * 2)
+        llm_slots = asyncio.Semaphore(self.concurrency)
+        # Bound the number of jobs in progress so huge inputs do not create every task at once
+        job_slots = asyncio.Semaphore(self.workers * 2 + self.concurrency * 2)
+        start = time.perf_counter()
+
+        with open(self.out_path, "a", encoding="utf-8") as out, \
+                open(self.checkpoint_path, "a", encoding="utf-8") as checkpoint, \
+                ProcessPoolExecutor(max_workers=self.workers) as pool:
+
+            async def bounded(job):
+                try:
+                    await self._process(job, pool, parse_slots, llm_slots, out, checkpoint)
+                finally:
+                    job_slots.release()
+
+            tasks = []
+            for job in todo:
+                await job_slots.acquire()
+                tasks.append(asyncio.ensure_future(bounded(job)))
+            await asyncio.gather(*tasks)
+
+        elapsed = time.perf_counter() - start
+        return {
+            "jobs": len(jobs),
+            **self.counts,
+            "seconds": round(elapsed, 2),
+            "resumes_per_second": round(len(todo) / elapsed, 2) if elapsed > 0 and todo else None,
+            "stages": self.stats.summary(),
+        }
+
+    def run(self, jobs: List[dict]) -> dict:
+        """Process ``jobs`` not yet in the checkpoint; returns the run summary."""
+        return asyncio.run(self.run_async(jobs))
+
+
+def format_summary(summary: dict) -> Iterator[str]:
+    yield (
+        f"{summary['jobs']} resumes: {summary['done']} done ({summary['cached']} from cache), "
+        f"{summary['failed']} failed, {summary['skipped']} already finished; {summary['seconds']}s"
+    )
+    if summary["duplicates"]:
+        yield f"  {summary['duplicates']} near-duplicates, {summary['reused']} roadmaps reused"
+
+    for name, stage in summary["stages"].items():
+        rate = f"{stage['items_per_second']}/s" if stage["items_per_second"] is not None else "-"
+        yield f"  {name:9} {stage['items']:6} items  {stage['busy_seconds']:9.2f}s busy  {rate:>10}"
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Generate SkillWise roadmaps for a batch of resumes.")
+    parser.add_argument("input", help="directory of resume PDFs, or a CSV/JSONL manifest")
+    parser.add_argument("--out", required=True, help="JSONL file results are appended to")
+    parser.add_argument("--checkpoint", help="checkpoint file (default: <out>.checkpoint)")
+    parser.add_argument("--role", help="target role (required for a directory; default for manifest rows)")
+    parser.add_argument("--goal", default="", help="career goal (default for all resumes)")
+    parser.add_argument("--workers", type=int, default=PARSE_WORKERS, help="parsing processes")
+    parser.add_argument("--concurrency", type=int, default=LLM_CONCURRENCY, help="concurrent Gemini requests")
+    parser.add_argument("--regenerate", action="store_true", help="ignore cached roadmaps")
+    parser.add_argument("--dedup", choices=DEDUP_MODES, default="reuse",
+                        help="near-duplicate resumes: reuse their roadmap, only flag them, or skip detection")
+    parser.add_argument("--dedup-threshold", type=float, help="similarity for a near-duplicate (default: SKILLWISE_DEDUP_THRESHOLD)")
+    parser.add_argument("--dedup-index", help="near-duplicate index database (default: SKILLWISE_DEDUP_INDEX)")
+    parser.add_argument("--api-key", default=os.getenv("GEMINI_API_KEY", ""), help="Gemini API key (default: GEMINI_API_KEY)")
+    args = parser.parse_args(argv)
+
+    if not args.api_key:
+        parser.error("a Gemini API key is required (--api-key or GEMINI_API_KEY)")
+    from gemini_client import configure
+
+    configure(args.api_key)
+    jobs = load_jobs(args.input, role=args.role, goal=args.goal)
+    pipeline = BatchPipeline(
+        args.out, args.checkpoint, workers=args.workers, concurrency=args.concurrency, regenerate=args.regenerate,
+        dedup=args.dedup, dedup_index=args.dedup_index, dedup_threshold=args.dedup_threshold,
+    )
+    summary = pipeline.run(jobs)
+    for line in format_summary(summary):
+        print(line)
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
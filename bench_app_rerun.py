@@ -0,0 +1,83 @@
+# bench_app_rerun.py
+"""
+Measure Streamlit rerun time per interaction against roadmap size.
+
+Runs app.py headlessly with Streamlit's AppTest and a synthetic roadmap
+already in session state (no resume upload or Gemini call). AppTest always
+reruns the whole script, so a toggle is reported two ways: the full rerun
+(what every click cost before the tracker became a fragment) and the time
+spent inside the Progress Tracker fragment, which is all a toggle reruns in
+a live session.
+
+    python bench_app_rerun.py
+    python bench_app_rerun.py --items 50 200 800 --toggles 10
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+DEFAULT_ITEMS = [25, 50, 100, 200, 400]
+APP_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "app.py")
+
+
+def synthetic_roadmap(n_items: int, items_per_section: int = 10, sections_per_phase: int = 3) -> str:
+    lines = []
+    for i in range(n_items):
+        if i % (items_per_section * sections_per_phase) == 0:
+            lines += ["", f"## Phase {i // (items_per_section * sections_per_phase) + 1}: Skill Building"]
+        if i % items_per_section == 0:
+            lines.append(f"**Section {i // items_per_section + 1}: Core Topics**")
+        lines.append(f"* Step {i + 1}: study topic {i + 1} and build a small project - YouTube, Beginner-Friendly")
+    return "\n".join(lines).strip()
+
+
+def bench_size(n_items: int, toggles: int, timeout: float) -> dict:
+    from streamlit.testing.v1 import AppTest
+
+    app = AppTest.from_file(APP_PATH, default_timeout=timeout)
+    app.session_state["roadmap"] = synthetic_roadmap(n_items)
+    app.session_state["resume_text"] = "Python developer with SQL, Docker and Git experience."
+    app.session_state["gemini_api_key"] = "benchmark"
+
+    start = time.perf_counter()
+    app.run()
+    full_run = time.perf_counter() - start
+    if app.exception:
+        raise SystemExit(f"app.py raised: {app.exception[0].value}")
+
+    rerun_times, fragment_times = [], []
+    for i in range(toggles):
+        checkbox = app.checkbox[i % len(app.checkbox)]
+        start = time.perf_counter()
+        checkbox.set_value(not checkbox.value).run()
+        rerun_times.append(time.perf_counter() - start)
+        fragment_times.append(app.session_state["render_timings"]["progress_tracker"])
+
+    return {
+        "items": n_items,
+        "full_ms": full_run * 1000,
+        "rerun_ms": statistics.median(rerun_times) * 1000,
+        "fragment_ms": statistics.median(fragment_times) * 1000,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark per-interaction rerun time against roadmap size.")
+    parser.add_argument("--items", nargs="+", type=int, default=DEFAULT_ITEMS, help="roadmap sizes (checklist items)")
+    parser.add_argument("--toggles", type=int, default=5, help="checkbox toggles timed per size")
+    parser.add_argument("--timeout", type=float, default=120, help="per-run timeout in seconds")
+    args = parser.parse_args(argv)
+
+    # Progress and share files land in the working directory
+    os.chdir(os.path.dirname(APP_PATH))
+    print(f"{'items':>6} {'first run ms':>13} {'full rerun ms':>14} {'fragment ms':>12}")
+    for n_items in args.items:
+        row = bench_size(n_items, args.toggles, args.timeout)
+        print(f"{row['items']:>6} {row['full_ms']:>13.0f} {row['rerun_ms']:>14.0f} {row['fragment_ms']:>12.0f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
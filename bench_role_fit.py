@@ -0,0 +1,88 @@
+# bench_role_fit.py
+"""
+Measure role-fit scoring throughput as the catalog grows.
+
+Synthetic catalogs of increasing size are scored against a batch of random
+resume skill sets, both one resume at a time and as a single batch.
+
+    python bench_role_fit.py
+    python bench_role_fit.py --resumes 5000 --sizes 50x200 500x2000 2000x5000
+"""
+import argparse
+import sys
+import time
+
+import numpy as np
+
+from role_fit import RoleFitEngine
+from skill_catalog import SkillCatalog
+
+DEFAULT_SIZES = ["15x50", "100x500", "500x2000", "2000x5000"]
+
+
+def synthetic_catalog(n_roles: int, n_skills: int, skills_per_role: int, rng: np.random.Generator) -> SkillCatalog:
+    skills = [f"Skill {i}" for i in range(n_skills)]
+    per_role = min(skills_per_role, n_skills)
+    roles = {}
+    for r in range(n_roles):
+        picks = rng.choice(n_skills, size=per_role, replace=False)
+        weights = rng.uniform(0.2, 1.0, size=per_role).round(2)
+        roles[f"Role {r}"] = {"skills": {skills[i]: float(w) for i, w in zip(picks, weights)}}
+    return SkillCatalog({"skills": {name: {} for name in skills}, "roles": roles})
+
+
+def bench_size(n_roles: int, n_skills: int, n_resumes: int, skills_per_role: int, k: int, rng: np.random.Generator) -> dict:
+    catalog = synthetic_catalog(n_roles, n_skills, skills_per_role, rng)
+
+    start = time.perf_counter()
+    engine = RoleFitEngine(catalog)
+    build_time = time.perf_counter() - start
+
+    skill_names = engine.skills
+    resumes = [
+        {skill_names[i] for i in rng.choice(n_skills, size=min(20, n_skills), replace=False)}
+        for _ in range(n_resumes)
+    ]
+
+    single_count = min(n_resumes, 500)
+    start = time.perf_counter()
+    for matched in resumes[:single_count]:
+        engine.top_roles(matched, k=k)
+    single_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    engine.top_roles_batch(resumes, k=k)
+    batch_time = time.perf_counter() - start
+
+    return {
+        "size": f"{n_roles}x{n_skills}",
+        "build_ms": build_time * 1000,
+        "single_per_sec": single_count / single_time,
+        "batch_per_sec": n_resumes / batch_time,
+        "pairs_per_sec": n_resumes * n_roles / batch_time,
+    }
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark role-fit scoring against catalog size.")
+    parser.add_argument("--sizes", nargs="+", default=DEFAULT_SIZES, help="catalog sizes as ROLESxSKILLS")
+    parser.add_argument("--resumes", type=int, default=2000, help="resumes scored per catalog size")
+    parser.add_argument("--skills-per-role", type=int, default=25)
+    parser.add_argument("--top-k", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'catalog':>12} {'build ms':>10} {'single/s':>12} {'batch/s':>12} {'pairs/s':>14}")
+    for size in args.sizes:
+        n_roles, n_skills = (int(part) for part in size.lower().split("x"))
+        row = bench_size(n_roles, n_skills, args.resumes, args.skills_per_role, args.top_k, rng)
+        print(
+            f"{row['size']:>12} {row['build_ms']:>10.1f} {row['single_per_sec']:>12,.0f} "
+            f"{row['batch_per_sec']:>12,.0f} {row['pairs_per_sec']:>14,.0f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
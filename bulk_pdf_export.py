@@ -0,0 +1,239 @@
+# bulk_pdf_export.py
+"""
+Export many stored roadmaps to PDF across a process pool.
+
+Inputs are roadmap JSON records (the app's JSON export, share-store blobs or
+any object with a "roadmap" markdown field) given as files or directories:
+``.json`` (one record or a list), ``.jsonl`` (one record per line) and
+``.json.gz``. PDFs are written as they finish, to a directory or a zip file.
+
+    python bulk_pdf_export.py exports/ --out pdfs/
+    python bulk_pdf_export.py cohort.jsonl shared_roadmaps/ --zip cohort.zip --workers 8
+"""
+import argparse
+import gzip
+import json
+import os
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Callable, Iterable, Iterator, Optional, Tuple
+
+EXPORT_WORKERS = int(os.getenv("SKILLWISE_EXPORT_WORKERS", os.cpu_count() or 1))
+RECORD_SUFFIXES = (".json", ".jsonl", ".json.gz")
+
+_SAFE_NAME = re.compile(r"[^A-Za-z0-9._-]+")
+
+
+def _record_name(path: str) -> str:
+    name = os.path.basename(path)
+    for suffix in RECORD_SUFFIXES:
+        if name.endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def _load_file(path: str, on_error: Optional[Callable[[str, str], None]] = None) -> Iterator[Tuple[str, dict]]:
+    stem = _record_name(path)
+    if path.endswith(".jsonl"):
+        with open(path, "r", encoding="utf-8") as f:
+            for line_num, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError as e:
+                    if on_error is None:
+                        raise
+                    on_error(f"{stem}-{line_num}", f"invalid JSON: {e}")
+                    continue
+                yield f"{stem}-{line_num}", record
+        return
+    try:
+        if path.endswith(".gz"):
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                data = json.load(f)
+        else:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+    except json.JSONDecodeError as e:
+        if on_error is None:
+            raise
+        on_error(stem, f"invalid JSON: {e}")
+        return
+    if isinstance(data, list):
+        for index, record in enumerate(data, start=1):
+            yield f"{stem}-{index}", record
+    else:
+        yield stem, data
+
+
+def iter_records(sources: Iterable[str], on_error: Optional[Callable[[str, str], None]] = None) -> Iterator[Tuple[str, dict]]:
+    """
+    Yield ``(name, record)`` for every roadmap record under ``sources``.
+
+    A malformed JSONL line or JSON file raises, unless ``on_error`` is given:
+    it is then called with the record or file name and the error, and reading
+    continues with the next record.
+    """
+    for source in sources:
+        if os.path.isdir(source):
+            paths = sorted(
+                os.path.join(root, name)
+                for root, _, names in os.walk(source)
+                for name in names if name.endswith(RECORD_SUFFIXES)
+            )
+        else:
+            paths = [source]
+        for path in paths:
+            for name, record in _load_file(path, on_error):
+                if isinstance(record, dict):
+                    yield _SAFE_NAME.sub("_", str(record.get("id") or name)), record
+
+
+def _init_export_worker() -> None:
+    from pdf_export import warm_up
+
+    warm_up()
+
+
+def _render_record(name: str, roadmap_text: str, options) -> Tuple[str, Optional[bytes], int, Optional[str]]:
+    from pdf_export import draw_layout, layout_roadmap
+    from roadmap_model import Roadmap
+
+    try:
+        layout = layout_roadmap(Roadmap(roadmap_text), options)
+        return name, draw_layout(layout), len(layout.pages), None
+    except Exception as e:
+        return name, None, 0, str(e)
+
+
+class _Output:
+    """Writes finished PDFs to a directory or a zip file, keeping names unique."""
+
+    def __init__(self, out_dir: Optional[str] = None, zip_path: Optional[str] = None):
+        self.out_dir = out_dir
+        self.zip = zipfile.ZipFile(zip_path, "w", compression=zipfile.ZIP_STORED) if zip_path else None
+        self.names = set()
+        if out_dir:
+            os.makedirs(out_dir, exist_ok=True)
+
+    def write(self, name: str, data: bytes) -> None:
+        filename = f"{name}.pdf"
+        suffix = 1
+        while filename in self.names:
+            suffix += 1
+            filename = f"{name}-{suffix}.pdf"
+        self.names.add(filename)
+        if self.zip is not None:
+            self.zip.writestr(filename, data)
+        else:
+            with open(os.path.join(self.out_dir, filename), "wb") as f:
+                f.write(data)
+
+    def close(self) -> None:
+        if self.zip is not None:
+            self.zip.close()
+
+
+def export_pdfs(
+    sources: Iterable[str],
+    out_dir: Optional[str] = None,
+    zip_path: Optional[str] = None,
+    workers: Optional[int] = None,
+    max_in_flight: Optional[int] = None,
+    options=None,
+) -> dict:
+    """
+    Render every roadmap record under ``sources`` to PDF.
+
+    Records are rendered across ``workers`` processes (each loads the logo and
+    font metrics once), with at most ``max_in_flight`` (default: two per
+    worker) submitted at a time, and written as they complete. Malformed
+    JSON lines and files count as failed and are skipped.
+
+    Returns:
+        dict: Summary with ``roadmaps``, ``pages``, ``failed``, ``skipped``,
+        ``bytes``, ``seconds`` and ``pages_per_second``
+    """
+    if not out_dir and not zip_path:
+        raise ValueError("Either out_dir or zip_path is required.")
+    workers = EXPORT_WORKERS if workers is None else max(1, workers)
+    max_in_flight = max_in_flight or workers * 2
+    summary = {"roadmaps": 0, "pages": 0, "failed": 0, "skipped": 0, "bytes": 0}
+    output = _Output(out_dir, zip_path)
+    start = time.perf_counter()
+
+    def fail(name: str, error: str) -> None:
+        summary["failed"] += 1
+        print(f"[export] {name}: {error}", file=sys.stderr)
+
+    def collect(result) -> None:
+        name, data, pages, error = result
+        if error:
+            fail(name, error)
+            return
+        output.write(name, data)
+        summary["roadmaps"] += 1
+        summary["pages"] += pages
+        summary["bytes"] += len(data)
+
+    def jobs() -> Iterator[Tuple[str, str]]:
+        for name, record in iter_records(sources, on_error=fail):
+            if isinstance(record.get("roadmap"), str) and record["roadmap"].strip():
+                yield name, record["roadmap"]
+            else:
+                summary["skipped"] += 1
+
+    try:
+        if workers == 1:
+            _init_export_worker()
+            for name, text in jobs():
+                collect(_render_record(name, text, options))
+        else:
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_export_worker) as pool:
+                pending = set()
+                for name, text in jobs():
+                    pending.add(pool.submit(_render_record, name, text, options))
+                    if len(pending) >= max_in_flight:
+                        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            collect(future.result())
+                for future in wait(pending).done:
+                    collect(future.result())
+    finally:
+        output.close()
+
+    summary["seconds"] = time.perf_counter() - start
+    summary["pages_per_second"] = summary["pages"] / summary["seconds"] if summary["seconds"] else 0.0
+    return summary
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Export stored roadmaps to PDF in bulk.")
+    parser.add_argument("sources", nargs="+", help="roadmap JSON/JSONL files or directories")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--out", help="directory to write PDFs to")
+    target.add_argument("--zip", help="zip file to write PDFs to")
+    parser.add_argument("--workers", type=int, default=EXPORT_WORKERS, help="worker processes")
+    parser.add_argument("--page-size", choices=["letter", "a4"], default="letter")
+    parser.add_argument("--no-logo", action="store_true", help="omit the logo from page headers")
+    args = parser.parse_args(argv)
+
+    from pdf_export import PdfOptions
+
+    options = PdfOptions(page_size=args.page_size, logo=not args.no_logo)
+    summary = export_pdfs(args.sources, out_dir=args.out, zip_path=args.zip, workers=args.workers, options=options)
+    print(
+        f"Exported {summary['roadmaps']} roadmaps ({summary['pages']} pages, {summary['bytes'] / 1e6:.1f} MB) "
+        f"in {summary['seconds']:.1f}s: {summary['pages_per_second']:.1f} pages/s"
+    )
+    if summary["failed"] or summary["skipped"]:
+        print(f"Failed: {summary['failed']}, skipped (no roadmap text): {summary['skipped']}")
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,156 @@
+# disk_cache.py
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+from typing import Any, Optional
+
+
+def make_key(*parts) -> str:
+    """Build a stable SHA-256 cache key from bytes and/or JSON-serializable parts."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, (bytes, bytearray, memoryview)):
+            digest.update(bytes(part))
+        else:
+            digest.update(json.dumps(part, sort_keys=True, default=str).encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class DiskCache:
+    """
+    Size-bounded, content-addressed cache of JSON values stored as files on local disk.
+
+    Entries are evicted in least-recently-used order once the total size on disk
+    exceeds ``max_bytes``. Recency is tracked through file modification times, so
+    the cache survives process restarts and can be shared by several workers.
+    Entries written with a ``ttl`` (or under a cache-wide ``default_ttl``) are
+    treated as misses and removed once they expire.
+    """
+
+    def __init__(self, directory: str, max_bytes: int = 64 * 1024 * 1024, default_ttl: Optional[float] = None):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.json")
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Return the cached value for ``key`` or ``default`` on a miss."""
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+            expires = entry["expires"]
+            value = entry["value"]
+        except (OSError, ValueError, KeyError, TypeError):
+            with self._lock:
+                self.misses += 1
+            return default
+        if expires is not None and expires < time.time():
+            self.delete(key)
+            with self._lock:
+                self.misses += 1
+            return default
+        try:
+            os.utime(path)  # Mark as recently used
+        except OSError:
+            pass
+        with self._lock:
+            self.hits += 1
+        return value
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None) -> None:
+        """Store ``value`` under ``key`` and evict old entries if over budget."""
+        ttl = self.default_ttl if ttl is None else ttl
+        entry = {"expires": time.time() + ttl if ttl else None, "value": value}
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self._path(key))
+        except Exception:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+        self._evict()
+
+    def delete(self, key: str) -> None:
+        """Remove ``key`` from the cache if present."""
+        try:
+            os.remove(self._path(key))
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        """Remove every entry from the cache."""
+        for entry in self._entries():
+            try:
+                os.remove(entry[2])
+            except OSError:
+                pass
+
+    def stats(self) -> dict:
+        """Return hit/miss counters and current on-disk usage."""
+        entries = self._entries()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+        }
+
+    def _entries(self):
+        entries = []
+        try:
+            with os.scandir(self.directory) as it:
+                for entry in it:
+                    if not entry.name.endswith(".json"):
+                        continue
+                    try:
+                        st = entry.stat()
+                    except OSError:
+                        continue
+                    entries.append((st.st_mtime, st.st_size, entry.path))
+        except OSError:
+            pass
+        return entries
+
+    def _evict(self) -> None:
+        with self._lock:
+            entries = self._entries()
+            total = sum(size for _, size, _ in entries)
+            if total <= self.max_bytes:
+                return
+            for _, size, path in sorted(entries):
+                try:
+                    os.remove(path)
+                except OSError:
+                    continue
+                total -= size
+                if total <= self.max_bytes:
+                    break
+
+
+_caches = {}
+
+
+def get_cache(name: str, max_bytes: Optional[int] = None, default_ttl: Optional[float] = None) -> DiskCache:
+    """Return the process-wide cache ``name`` under ``SKILLWISE_CACHE_DIR``."""
+    if name not in _caches:
+        root = os.getenv("SKILLWISE_CACHE_DIR", ".skillwise_cache")
+        if max_bytes is None:
+            max_bytes = int(os.getenv("SKILLWISE_CACHE_MAX_BYTES", 64 * 1024 * 1024))
+        _caches[name] = DiskCache(os.path.join(root, name), max_bytes=max_bytes, default_ttl=default_ttl)
+    return _caches[name]
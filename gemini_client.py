@@ -0,0 +1,435 @@
+# gemini_client.py
+import asyncio
+import contextvars
+import os
+import random
+import re
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import Iterator, List, Optional, Sequence
+
+from startup import timed_import
+
+DEFAULT_MODEL = "gemini-1.5-flash"
+# Requests allowed to be in flight at once across all sessions of this process
+MAX_CONCURRENCY = int(os.getenv("SKILLWISE_GEMINI_CONCURRENCY", "4"))
+# Sustained request rate (requests per minute) enforced by a token bucket
+REQUESTS_PER_MINUTE = float(os.getenv("SKILLWISE_GEMINI_RPM", "15"))
+BACKOFF_BASE = 1.0
+# Longest a streaming request waits for a concurrency slot before failing (retryably)
+SLOT_TIMEOUT = float(os.getenv("SKILLWISE_GEMINI_SLOT_TIMEOUT", "60"))
+BACKOFF_MAX = 30.0
+
+# Hedging: issue a second request when the first is slower than this
+# percentile of recent latencies for the model (opt-in)
+HEDGE_ENABLED = os.getenv("SKILLWISE_GEMINI_HEDGE", "0") == "1"
+HEDGE_PERCENTILE = float(os.getenv("SKILLWISE_GEMINI_HEDGE_PERCENTILE", "0.95"))
+HEDGE_MIN_SAMPLES = 20
+# Hedge delay used until enough latencies have been recorded
+HEDGE_DEFAULT_DELAY = float(os.getenv("SKILLWISE_GEMINI_HEDGE_DELAY", "8"))
+LATENCY_WINDOW = 200
+# API keys whose SDK clients are kept; the least recently used key's clients are dropped beyond this
+MAX_CLIENT_KEYS = int(os.getenv("SKILLWISE_GEMINI_MAX_CLIENT_KEYS", "32"))
+# Models tried in order after retryable failures of the primary model (opt-in,
+# e.g. "gemini-1.5-flash-8b"); by default retries stay on the primary model
+FALLBACK_MODELS = [m.strip() for m in os.getenv("SKILLWISE_GEMINI_FALLBACK_MODELS", "").split(",") if m.strip()]
+
+_RETRYABLE_STATUS = {408, 429, 500, 502, 503, 504}
+_NON_RETRYABLE_STATUS = {400, 401, 403, 404}
+_RETRY_DELAY_PATTERN = re.compile(r"retry[_ -]?(?:delay|after)\D{0,20}(\d+(?:\.\d+)?)", re.IGNORECASE)
+# Daily/project quotas do not recover within a retry window
+_HARD_QUOTA_PATTERN = re.compile(r"per[ _-]?day|billing", re.IGNORECASE)
+
+
+class GeminiError(Exception):
+    """Raised when a Gemini request fails; ``retryable`` tells whether retrying could help."""
+
+    def __init__(self, message: str, retryable: bool = False, retry_after: Optional[float] = None, quota: bool = False):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+        self.quota = quota
+
+
+class TokenBucket:
+    """Thread-safe token bucket; ``reserve`` returns how long the caller must wait."""
+
+    def __init__(self, rate_per_second: float, capacity: float):
+        self.rate = rate_per_second
+        self.capacity = capacity
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def reserve(self) -> float:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            if self._tokens >= 0:
+                return 0.0
+            return -self._tokens / self.rate
+
+
+class LatencyTracker:
+    """Per-model sliding window of successful request latencies, plus hedge counters."""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self.window = window
+        self._samples = {}
+        self._counters = {"hedges_issued": 0, "hedges_won": 0, "fallbacks": 0}
+        self._lock = threading.Lock()
+
+    def record(self, model_name: str, seconds: float) -> None:
+        with self._lock:
+            self._samples.setdefault(model_name, deque(maxlen=self.window)).append(seconds)
+
+    def count(self, counter: str) -> None:
+        with self._lock:
+            self._counters[counter] += 1
+
+    def percentile(self, model_name: str, q: float) -> Optional[float]:
+        """Latency at quantile ``q`` (0-1), or None until HEDGE_MIN_SAMPLES are recorded."""
+        with self._lock:
+            samples = sorted(self._samples.get(model_name, ()))
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return None
+        return samples[min(len(samples) - 1, int(q * len(samples)))]
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            models = {name: list(samples) for name, samples in self._samples.items()}
+            counters = dict(self._counters)
+        summary = {}
+        for name, samples in models.items():
+            ordered = sorted(samples)
+            summary[name] = {
+                "count": len(ordered),
+                "p50": ordered[len(ordered) // 2],
+                "p95": ordered[min(len(ordered) - 1, int(0.95 * len(ordered)))],
+                "p99": ordered[min(len(ordered) - 1, int(0.99 * len(ordered)))],
+            }
+        return {"models": summary, **counters}
+
+
+latencies = LatencyTracker()
+# api_key -> {"manager": SDK client manager or None, "models": {model_name: GenerativeModel}}
+_clients: "OrderedDict[Optional[str], dict]" = OrderedDict()
+_models_lock = threading.Lock()
+# API key of the current session/task; read where a request starts and passed down explicitly
+_api_key: contextvars.ContextVar = contextvars.ContextVar("gemini_api_key", default=None)
+_loop = None
+_loop_lock = threading.Lock()
+_slots = threading.BoundedSemaphore(MAX_CONCURRENCY)
+_bucket = TokenBucket(REQUESTS_PER_MINUTE / 60.0, capacity=max(1, MAX_CONCURRENCY))
+
+
+def _genai():
+    # The SDK is slow to import, so load it on the first request
+    return timed_import("google.generativeai")
+
+
+def configure(api_key: str) -> None:
+    """
+    Use ``api_key`` for requests made from the current context (a Streamlit
+    session's script thread, or an asyncio task and the tasks it starts).
+    Other sessions keep their own keys; without a key the SDK falls back to
+    GEMINI_API_KEY/GOOGLE_API_KEY.
+    """
+    _api_key.set(api_key or None)
+
+
+def current_api_key() -> Optional[str]:
+    return _api_key.get()
+
+
+def get_model(model_name: str = DEFAULT_MODEL, api_key: Optional[str] = None, asynchronous: bool = False):
+    """
+    Return the shared ``GenerativeModel`` for ``(api_key, model_name)``.
+
+    The SDK binds a model to the process-wide default clients on first use,
+    so a model shared across keys would bill every session to whichever key
+    came first. Each key therefore gets its own client manager, and its
+    clients are attached here; the async client is created lazily on the
+    client loop, which its transport is bound to. This relies on SDK
+    internals (``client._ClientManager`` and the model's ``_client`` /
+    ``_async_client``), which is why requirements.txt caps the SDK version.
+    Clients for at most MAX_CLIENT_KEYS keys are kept, least recently used
+    first out.
+    """
+    with _models_lock:
+        entry = _clients.get(api_key)
+        if entry is None:
+            manager = None
+            if api_key:
+                manager = timed_import("google.generativeai.client")._ClientManager()
+                manager.configure(api_key=api_key)
+            entry = _clients[api_key] = {"manager": manager, "models": {}}
+            while len(_clients) > max(1, MAX_CLIENT_KEYS):
+                _clients.popitem(last=False)
+        _clients.move_to_end(api_key)
+        model = entry["models"].get(model_name)
+        if model is None:
+            model = entry["models"][model_name] = _genai().GenerativeModel(model_name)
+        if entry["manager"] is not None:
+            attr, name = ("_async_client", "generative_async") if asynchronous else ("_client", "generative")
+            if getattr(model, attr, None) is None:
+                setattr(model, attr, entry["manager"].get_default_client(name))
+        return model
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    # google.api_core exceptions carry the HTTP status as an int ``code``
+    code = getattr(error, "code", None)
+    return code if isinstance(code, int) else None
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    value = headers.get("retry-after") or headers.get("Retry-After")
+    if value:
+        try:
+            return float(value)
+        except ValueError:
+            pass
+    match = _RETRY_DELAY_PATTERN.search(str(error))
+    return float(match.group(1)) if match else None
+
+
+def classify_error(error: Exception) -> GeminiError:
+    """Map an exception from the SDK to a ``GeminiError`` with retry information."""
+    if isinstance(error, GeminiError):
+        return error
+    message = str(error) or error.__class__.__name__
+    status = _status_code(error)
+    name = error.__class__.__name__
+    if status == 429 or name in ("ResourceExhausted", "TooManyRequests"):
+        retryable = not _HARD_QUOTA_PATTERN.search(message)
+        return GeminiError(message, retryable=retryable, retry_after=_retry_after(error), quota=True)
+    if status in _RETRYABLE_STATUS or name in ("ServiceUnavailable", "DeadlineExceeded", "InternalServerError"):
+        return GeminiError(message, retryable=True, retry_after=_retry_after(error))
+    if status in _NON_RETRYABLE_STATUS or name in ("BlockedPromptException", "StopCandidateException", "InvalidArgument", "PermissionDenied"):
+        return GeminiError(message, retryable=False)
+    if isinstance(error, (ConnectionError, TimeoutError, asyncio.TimeoutError)):
+        return GeminiError(message, retryable=True)
+    return GeminiError(message, retryable=False)
+
+
+def backoff_delay(attempt: int, retry_after: Optional[float] = None) -> float:
+    """Full-jitter exponential backoff, never shorter than a server-provided retry-after."""
+    delay = random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** attempt))
+    if retry_after is not None:
+        delay = max(delay, retry_after)
+    return delay
+
+
+def _client_loop() -> asyncio.AbstractEventLoop:
+    """
+    Return the event loop that owns all async Gemini calls, starting it on
+    first use. The SDK's async transport is bound to the loop it was created
+    on, so every request runs here whatever loop the caller is on.
+    """
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="gemini-client", daemon=True).start()
+        return _loop
+
+
+def run_sync(coro):
+    """Run a coroutine on the client loop and block until it finishes."""
+    return asyncio.run_coroutine_threadsafe(coro, _client_loop()).result()
+
+
+async def _on_client_loop(coro):
+    loop = _client_loop()
+    try:
+        running = asyncio.get_running_loop()
+    except RuntimeError:
+        running = None
+    if running is loop:
+        return await coro
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+
+async def _acquire_slot() -> None:
+    # Poll instead of blocking so waiting never ties up a thread or an event loop
+    while not _slots.acquire(blocking=False):
+        await asyncio.sleep(0.05)
+
+
+def _response_text(response) -> str:
+    try:
+        return response.text if response else ""
+    except ValueError as e:  # Raised by the SDK when the candidate was blocked
+        raise GeminiError(str(e), retryable=False)
+
+
+def model_chain(model_name: str = DEFAULT_MODEL, fallback_models: Optional[Sequence[str]] = None) -> List[str]:
+    """Primary model followed by the configured fallbacks, without duplicates."""
+    fallback_models = FALLBACK_MODELS if fallback_models is None else fallback_models
+    chain = [model_name]
+    for name in fallback_models:
+        if name not in chain:
+            chain.append(name)
+    return chain
+
+
+def hedge_delay(model_name: str) -> float:
+    """Seconds to wait before hedging, adapted from recent latencies."""
+    threshold = latencies.percentile(model_name, HEDGE_PERCENTILE)
+    return HEDGE_DEFAULT_DELAY if threshold is None else threshold
+
+
+async def generate_async(
+    prompt: str,
+    model_name: str = DEFAULT_MODEL,
+    max_retries: int = 3,
+    timeout: Optional[float] = None,
+    hedge: Optional[bool] = None,
+    fallback_models: Optional[Sequence[str]] = None,
+    stats: Optional[dict] = None,
+) -> str:
+    """
+    Generate text with the shared model for ``model_name``.
+
+    Requests go through the process-wide concurrency limit and token bucket.
+    Only retryable failures are retried, with jittered backoff that honors
+    retry-after hints; each retry moves one step down the fallback model
+    chain. With ``hedge`` (default: SKILLWISE_GEMINI_HEDGE), a request still
+    running after ``hedge_delay`` gets a duplicate and the first to finish
+    wins. ``stats``, if given, gets the ``model`` that served the response.
+    Safe to await from any event loop.
+
+    Raises:
+        GeminiError: On a non-retryable failure, or once retries are exhausted
+    """
+    return await _on_client_loop(
+        _generate(prompt, model_name, max_retries, timeout, hedge, fallback_models, current_api_key(), stats)
+    )
+
+
+async def _attempt(prompt: str, model_name: str, timeout: Optional[float], api_key: Optional[str] = None) -> str:
+    model = get_model(model_name, api_key, asynchronous=True)
+    await _acquire_slot()
+    try:
+        wait = _bucket.reserve()
+        if wait:
+            await asyncio.sleep(wait)
+        start = time.perf_counter()
+        request = model.generate_content_async(prompt)
+        response = await (asyncio.wait_for(request, timeout) if timeout else request)
+        text = _response_text(response)
+        if not text:
+            raise GeminiError("Empty response from model", retryable=True)
+        latencies.record(model_name, time.perf_counter() - start)
+        return text
+    except asyncio.CancelledError:
+        raise
+    except Exception as e:
+        raise classify_error(e)
+    finally:
+        _slots.release()
+
+
+async def _hedged_attempt(prompt: str, model_name: str, timeout: Optional[float], api_key: Optional[str] = None) -> str:
+    started = time.perf_counter()
+    first = asyncio.ensure_future(_attempt(prompt, model_name, timeout, api_key))
+    done, _ = await asyncio.wait({first}, timeout=hedge_delay(model_name))
+    if done:
+        return first.result()
+
+    latencies.count("hedges_issued")
+    second = asyncio.ensure_future(_attempt(prompt, model_name, timeout, api_key))
+    pending = {first, second}
+    error = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    if task is second:
+                        latencies.count("hedges_won")
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+        if first in pending:
+            # The slow attempt never finishes, so record how long it ran as a
+            # censored sample; leaving it out would pull the hedge threshold down
+            latencies.record(model_name, time.perf_counter() - started)
+
+
+async def _generate(prompt, model_name, max_retries, timeout, hedge=None, fallback_models=None, api_key=None, stats=None) -> str:
+    hedge = HEDGE_ENABLED if hedge is None else hedge
+    chain = model_chain(model_name, fallback_models)
+    last_error = None
+    for attempt in range(max_retries):
+        current = chain[min(attempt, len(chain) - 1)]
+        if attempt and current != chain[min(attempt - 1, len(chain) - 1)]:
+            latencies.count("fallbacks")
+        try:
+            if hedge:
+                text = await _hedged_attempt(prompt, current, timeout, api_key)
+            else:
+                text = await _attempt(prompt, current, timeout, api_key)
+            if stats is not None:
+                stats["model"] = current
+            return text
+        except GeminiError as e:
+            last_error = e
+        if attempt + 1 >= max_retries:
+            break
+        next_model = chain[min(attempt + 1, len(chain) - 1)]
+        # Quotas are per model, so an exhausted primary can still fall back
+        if not last_error.retryable and not (last_error.quota and next_model != current):
+            break
+        # Switching to a different model needs no backoff; retrying the same one does
+        if next_model == current:
+            await asyncio.sleep(backoff_delay(attempt + 1, last_error.retry_after))
+    raise last_error
+
+
+def generate_text(prompt: str, model_name: str = DEFAULT_MODEL, max_retries: int = 3, timeout: Optional[float] = None, hedge: Optional[bool] = None) -> str:
+    """Blocking wrapper around ``generate_async`` for synchronous callers."""
+    return run_sync(_generate(prompt, model_name, max_retries, timeout, hedge, api_key=current_api_key()))
+
+
+def latency_stats() -> dict:
+    """Recent per-model latency percentiles and hedge/fallback counters."""
+    return latencies.snapshot()
+
+
+def stream_text(prompt: str, model_name: str = DEFAULT_MODEL) -> Iterator[str]:
+    """
+    Yield text chunks from a single streaming request.
+
+    The concurrency slot is held until the stream finishes; waiting for one
+    gives up after SLOT_TIMEOUT seconds, so a stuck stream cannot starve
+    other sessions indefinitely. Streaming requests are not hedged (hedging
+    applies to ``generate_async`` only). Errors are raised as
+    ``GeminiError`` so callers can decide whether to retry.
+    """
+    model = get_model(model_name, current_api_key())
+    if not _slots.acquire(timeout=SLOT_TIMEOUT):
+        raise GeminiError(f"No Gemini request slot became free within {SLOT_TIMEOUT:g}s", retryable=True)
+    try:
+        wait = _bucket.reserve()
+        if wait:
+            time.sleep(wait)
+        for chunk in model.generate_content(prompt, stream=True):
+            text = _response_text(chunk)
+            if text:
+                yield text
+    except GeminiError:
+        raise
+    except Exception as e:
+        raise classify_error(e)
+    finally:
+        _slots.release()
@@ -1,74 +1,186 @@
 import re
-import nltk
 import os
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
+from functools import lru_cache
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+# Project-controlled NLTK data directory, filled by provision_nltk.py
+NLTK_DATA_DIR = os.getenv("SKILLWISE_NLTK_DATA", os.path.join(BASE_DIR, "nltk_data"))
+# Pre-serialized English stopwords, so the default path never imports NLTK
+STOPWORDS_FILE = os.path.join(BASE_DIR, "data", "stopwords_english.txt")
+# Runtime downloads are off by default; provision ahead of time instead
+ALLOW_NLTK_DOWNLOAD = os.getenv("SKILLWISE_NLTK_ALLOW_DOWNLOAD", "0") == "1"
+NLTK_RESOURCES = {
+    "punkt": "tokenizers/punkt",
+    "punkt_tab": "tokenizers/punkt_tab",
+    "stopwords": "corpora/stopwords",
+}
+
+# "regex" splits on alphanumeric runs; "nltk" uses word_tokenize
+TOKENIZER = os.getenv("SKILLWISE_GOAL_TOKENIZER", "regex")
+
+TECH_TERMS = ['dev', 'code', 'program', 'software', 'data', 'ai', 'ml', 'web', 'cloud']
+ROLE_TERMS = ['engineer', 'developer', 'architect', 'manager', 'analyst', 'designer']
+
+# Unicode letter/digit runs, so accented words ("développeur", "zürich") stay whole
+_TOKEN_PATTERN = re.compile(r"[^\W_]+")
+# One pass per keyword reports both categories; each lookahead is optional so
+# a keyword can be technical, a role, both or neither
+_CATEGORY_MATCHER = re.compile(
+    r"(?=(?:.*?(?P<tech>" + "|".join(map(re.escape, TECH_TERMS)) + r"))?)"
+    r"(?=(?:.*?(?P<role>" + "|".join(map(re.escape, ROLE_TERMS)) + r"))?)"
+)
 
 # Global flag to track if NLTK data is downloaded
 _nltk_data_downloaded = False
 
+def _nltk():
+    """Import NLTK on first use and point it at the project data directory."""
+    import nltk
+    if NLTK_DATA_DIR not in nltk.data.path:
+        nltk.data.path.insert(0, NLTK_DATA_DIR)
+    return nltk
+
+def nltk_readiness(data_dir=None):
+    """
+    Report which NLTK resources are available locally (only in ``data_dir``
+    when given); never touches the network.
+    """
+    try:
+        nltk = _nltk()
+    except ImportError:
+        return {name: False for name in NLTK_RESOURCES}
+    status = {}
+    for name, path in NLTK_RESOURCES.items():
+        try:
+            nltk.data.find(path, paths=[data_dir] if data_dir else None)
+            status[name] = True
+        except LookupError:
+            status[name] = False
+    return status
+
+def is_ready(tokenizer=None, data_dir=None):
+    """Return True if goal analysis can run offline with the given tokenizer (and NLTK data directory)."""
+    if (tokenizer or TOKENIZER) == "nltk":
+        status = nltk_readiness(data_dir)
+        return (status["punkt"] or status["punkt_tab"]) and status["stopwords"]
+    return os.path.exists(STOPWORDS_FILE) or nltk_readiness(data_dir)["stopwords"]
+
 def ensure_nltk_data():
-    """Ensure NLTK data is downloaded only once."""
+    """
+    Ensure NLTK data is available only once.
+    
+    Missing data is downloaded into NLTK_DATA_DIR only when
+    SKILLWISE_NLTK_ALLOW_DOWNLOAD=1; otherwise run ``provision_nltk.py``.
+    """
     global _nltk_data_downloaded
     
     if _nltk_data_downloaded:
         return
         
-    try:
-        # Check and download required NLTK data
-        required_data = ['punkt', 'stopwords']
-        for item in required_data:
-            try:
-                nltk.data.find(f'tokenizers/{item}' if item == 'punkt' else f'corpora/{item}')
-            except LookupError:
-                nltk.download(item, quiet=True)
+    status = nltk_readiness()
+    missing = [item for item in ('punkt', 'stopwords') if not status[item]]
+    if 'punkt' in missing and status['punkt_tab']:
+        missing.remove('punkt')
+    if missing:
+        if not ALLOW_NLTK_DOWNLOAD:
+            raise Exception(f"NLTK data missing: {', '.join(missing)}. Run `python provision_nltk.py` to install it into {NLTK_DATA_DIR}.")
+        try:
+            nltk = _nltk()
+            for item in missing + (['punkt_tab'] if 'punkt' in missing else []):
+                nltk.download(item, download_dir=NLTK_DATA_DIR, quiet=True)
+        except Exception as e:
+            raise Exception(f"Failed to download NLTK data: {str(e)}")
+    
+    _nltk_data_downloaded = True
+
+@lru_cache(maxsize=1)
+def get_stopwords():
+    """English stopwords as a frozenset, loaded once per process."""
+    if os.path.exists(STOPWORDS_FILE):
+        with open(STOPWORDS_FILE, encoding="utf-8") as f:
+            return frozenset(line.strip() for line in f if line.strip())
+    ensure_nltk_data()
+    from nltk.corpus import stopwords
+    return frozenset(stopwords.words('english'))
+
+def normalize_goal(text):
+    """Lowercase and collapse whitespace; the memoization key for goal analysis."""
+    return " ".join(text.lower().split())
+
+def tokenize(text, tokenizer=None):
+    """Split normalized text into tokens with the configured tokenizer."""
+    if (tokenizer or TOKENIZER) == "nltk":
+        ensure_nltk_data()
+        from nltk.tokenize import word_tokenize
+        return word_tokenize(text)
+    return _TOKEN_PATTERN.findall(text)
+
+@lru_cache(maxsize=1024)
+def _goal_keywords(normalized, tokenizer):
+    stop_words = get_stopwords()
+    return tuple(sorted({
+        word for word in tokenize(normalized, tokenizer)
+        if word.isalnum() and
+        word not in stop_words and
+        len(word) > 2  # Filter out very short words
+    }))
+
+def extract_goal_keywords(text, tokenizer=None):
+    """Return the sorted, de-duplicated keywords of a career goal."""
+    return list(_goal_keywords(normalize_goal(text), tokenizer or TOKENIZER))
+
+def categorize_keywords(keywords):
+    """Split keywords into (technical, role, other) lists with a single matcher pass each."""
+    tech_keywords, role_keywords, other_keywords = [], [], []
+    for keyword in keywords:
+        match = _CATEGORY_MATCHER.match(keyword)
+        if match.group("tech"):
+            tech_keywords.append(keyword)
+        if match.group("role"):
+            role_keywords.append(keyword)
+        if not match.group("tech") and not match.group("role"):
+            other_keywords.append(keyword)
+    return tech_keywords, role_keywords, other_keywords
+
+@lru_cache(maxsize=1024)
+def _analyze_normalized(normalized, tokenizer):
+    keywords = _goal_keywords(normalized, tokenizer)
+    
+    if not keywords:
+        return "⚠️ No meaningful keywords extracted from your goal. Please provide more specific details."
         
-        _nltk_data_downloaded = True
-    except Exception as e:
-        raise Exception(f"Failed to download NLTK data: {str(e)}")
+    # Format output with categories
+    tech_keywords, role_keywords, other_keywords = categorize_keywords(keywords)
+    
+    output = "🔍 Keywords extracted from your goal:\n\n"
+    if tech_keywords:
+        output += f"💻 Technical Skills: {', '.join(tech_keywords)}\n"
+    if role_keywords:
+        output += f"👨‍💼 Roles: {', '.join(role_keywords)}\n"
+    if other_keywords:
+        output += f"📌 Other Keywords: {', '.join(other_keywords)}"
+        
+    return output
 
-def analyze_goals(text):
-    """Analyze career goals and extract meaningful keywords."""
+def analyze_goals(text, tokenizer=None):
+    """
+    Analyze career goals and extract meaningful keywords.
+    
+    Results are memoized per normalized goal text. A list or tuple of goals
+    returns a list of results in the same order.
+    """
+    if isinstance(text, (list, tuple)):
+        return [analyze_goals(goal, tokenizer) for goal in text]
+    
     if not text or not isinstance(text, str):
         return "⚠️ Please provide a valid career goal text."
         
     try:
-        ensure_nltk_data()
-        
-        # Clean and normalize text
-        text = text.lower().strip()
-        if not text:
+        normalized = normalize_goal(text)
+        if not normalized:
             return "⚠️ Empty goal text provided."
             
-        # Tokenize and filter words
-        words = word_tokenize(text)
-        filtered_words = [
-            word for word in words
-            if word.isalnum() and 
-            word not in stopwords.words('english') and
-            len(word) > 2  # Filter out very short words
-        ]
-        
-        # Extract unique keywords
-        keywords = sorted(set(filtered_words))
-        
-        if not keywords:
-            return "⚠️ No meaningful keywords extracted from your goal. Please provide more specific details."
-            
-        # Format output with categories
-        tech_keywords = [k for k in keywords if any(tech in k.lower() for tech in ['dev', 'code', 'program', 'software', 'data', 'ai', 'ml', 'web', 'cloud'])]
-        role_keywords = [k for k in keywords if any(role in k.lower() for role in ['engineer', 'developer', 'architect', 'manager', 'analyst', 'designer'])]
-        other_keywords = [k for k in keywords if k not in tech_keywords and k not in role_keywords]
-        
-        output = "🔍 Keywords extracted from your goal:\n\n"
-        if tech_keywords:
-            output += f"💻 Technical Skills: {', '.join(tech_keywords)}\n"
-        if role_keywords:
-            output += f"👨‍💼 Roles: {', '.join(role_keywords)}\n"
-        if other_keywords:
-            output += f"📌 Other Keywords: {', '.join(other_keywords)}"
-            
-        return output
+        return _analyze_normalized(normalized, tokenizer or TOKENIZER)
         
     except Exception as e:
-        return f"⚠️ Error analyzing goal: {str(e)}"
\ No newline at end of file
+        return f"⚠️ Error analyzing goal: {str(e)}"
@@ -0,0 +1,300 @@
+# pdf_export.py
+import base64
+import os
+from datetime import datetime
+from functools import lru_cache
+from io import BytesIO
+from typing import List, NamedTuple, Optional, Tuple, Union
+
+from reportlab.lib.colors import HexColor
+from reportlab.lib.pagesizes import A4, letter
+from reportlab.lib.units import inch
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase.pdfmetrics import stringWidth
+from reportlab.pdfgen import canvas
+
+from disk_cache import get_cache, make_key
+from roadmap_model import Roadmap, get_roadmap
+
+# Bump whenever the layout or drawing changes so cached PDFs are not reused
+PDF_RENDERER_VERSION = 1
+PDF_CACHE_TTL = float(os.getenv("SKILLWISE_PDF_CACHE_TTL", 7 * 24 * 3600))
+LOGO_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "logo.png")
+LOGO_SIZE = 0.5 * inch  # Drawn size of the (square) logo
+# The logo is downscaled once to this resolution instead of embedding the full image
+LOGO_DPI = 300
+PAGE_SIZES = {"letter": letter, "a4": A4}
+
+# Color scheme
+PRIMARY_COLOR = HexColor("#4a69bd")    # Main blue
+ACCENT_COLOR = HexColor("#60a5fa")     # Light blue
+TEXT_COLOR = HexColor("#2d2d44")       # Dark gray
+PHASE_COLOR = HexColor("#1a1a2e")      # Dark blue for phases
+
+LEFT_MARGIN = 1 * inch
+RIGHT_MARGIN = 1 * inch
+TOP_MARGIN = 1 * inch
+BOTTOM_MARGIN = 0.75 * inch
+BULLET_INDENT = LEFT_MARGIN + 0.3 * inch
+
+
+class PdfOptions(NamedTuple):
+    page_size: str = "letter"
+    logo: bool = True
+    title: str = "SkillWise Learning Roadmap"
+
+
+class PdfLayout(NamedTuple):
+    """Positioned drawing operations per page, independent of any canvas."""
+    pages: List[List[tuple]]
+    page_size: Tuple[float, float]
+    options: PdfOptions
+    generated_at: str
+
+
+# Single characters normalized for the built-in (Latin-1) fonts
+_CHAR_MAP = str.maketrans({
+    "–": "-",  # En dash to hyphen
+    "—": "-",  # Em dash to hyphen
+    "’": "'",  # Right single quote to straight quote
+    "‘": "'",  # Left single quote to straight quote
+    "“": '"',  # Left double quote to straight quote
+    "”": '"',  # Right double quote to straight quote
+    "*": None,  # Remove residual Markdown stars
+    "•": "-",  # Convert bullet points to hyphens
+    "◦": "-",  # Convert sub-bullets to hyphens
+})
+
+
+@lru_cache(maxsize=4096)
+def clean_text(text: str) -> str:
+    """Normalize roadmap text for the PDF's built-in fonts."""
+    text = text.translate(_CHAR_MAP)
+    text = text.replace(". ", "- ")  # Standardize bullet points
+    # Convert hyphens to colons for better readability
+    text = text.replace(" - ", ": ").replace(" -", ": ")
+    return " ".join(text.split()).encode("ascii", "ignore").decode("ascii")
+
+
+@lru_cache(maxsize=65536)
+def word_width(word: str, font_name: str, font_size: float) -> float:
+    """Width of ``word`` plus a trailing space, memoized per font and size."""
+    return stringWidth(word + " ", font_name, font_size)
+
+
+@lru_cache(maxsize=1)
+def logo_image() -> Optional[ImageReader]:
+    """The logo, decoded and downscaled once per process (None if it cannot be read)."""
+    try:
+        from PIL import Image
+
+        pixels = int(LOGO_SIZE / inch * LOGO_DPI)
+        with Image.open(LOGO_PATH) as image:
+            image.load()
+            image.thumbnail((pixels, pixels), Image.LANCZOS)
+            return ImageReader(image.copy())
+    except Exception as e:
+        print(f"[PDF] Could not load logo at {LOGO_PATH}: {e}")
+        return None
+
+
+def warm_up() -> None:
+    """Load the logo and font metrics ahead of the first render, e.g. in a new worker process."""
+    logo_image()
+    for font_name in ("Helvetica", "Helvetica-Bold"):
+        stringWidth(" ", font_name, 12)
+
+
+def wrap_words(text: str, max_width: float, font_name: str, font_size: float) -> List[str]:
+    """Greedy word wrap of ``text`` to ``max_width`` points."""
+    lines = []
+    current_line = []
+    current_width = 0.0
+    for word in text.split():
+        width = word_width(word, font_name, font_size)
+        if current_line and current_width + width > max_width:
+            lines.append(" ".join(current_line))
+            current_line = [word]
+            current_width = width
+        else:
+            current_line.append(word)
+            current_width += width
+    if current_line:
+        lines.append(" ".join(current_line))
+    return lines
+
+
+class _Layout:
+    def __init__(self, options: PdfOptions):
+        self.options = options
+        self.width, self.height = PAGE_SIZES.get(options.page_size.lower(), letter)
+        self.content_width = self.width - LEFT_MARGIN - RIGHT_MARGIN
+        self.pages: List[List[tuple]] = [[]]
+        self.y = self.height - TOP_MARGIN - 0.5 * inch
+
+    def line(self, y: float, color, line_width: float) -> None:
+        self.pages[-1].append(("line", color, line_width, LEFT_MARGIN, y, self.width - RIGHT_MARGIN, y))
+
+    def text(self, text: str, x: float, max_width: float, font_name: str, font_size: float, spacing: float, color) -> None:
+        for line in wrap_words(text, max_width, font_name, font_size):
+            self.pages[-1].append(("text", font_name, font_size, color, x, self.y, line))
+            self.y -= spacing
+
+    def ensure_space(self, needed: float) -> None:
+        if self.y < BOTTOM_MARGIN + needed:
+            self.pages.append([])
+            self.y = self.height - TOP_MARGIN - 0.5 * inch
+
+    def section_header(self, text: str, is_phase: bool) -> None:
+        # Decorative lines above and below the header text
+        self.line(self.y + 0.2 * inch, ACCENT_COLOR, 1)
+        if is_phase:
+            self.text(text, LEFT_MARGIN, self.content_width, "Helvetica-Bold", 20, 24, PHASE_COLOR)
+        else:
+            self.text(text, LEFT_MARGIN, self.content_width, "Helvetica-Bold", 16, 20, PRIMARY_COLOR)
+        self.line(self.y - 0.1 * inch, ACCENT_COLOR, 1)
+        self.y -= 0.2 * inch
+
+    def item(self, text: str, sub: bool) -> None:
+        indent = BULLET_INDENT + (0.2 * inch if sub else 0)
+        width = self.content_width - (indent - LEFT_MARGIN)
+        marker = "  ◦" if sub else "•"
+        size = 11 if sub else 12
+        if ":" in text:
+            # Title in bold, description below it
+            title, description = text.split(":", 1)
+            self.text(f"{marker} {title.strip()}:", indent, width, "Helvetica-Bold", size, 14 if sub else 16,
+                      ACCENT_COLOR if sub else PRIMARY_COLOR)
+            self.text(f"{'    ' if sub else '  '}{description.strip()}", indent + 0.2 * inch, width - 0.2 * inch,
+                      "Helvetica", size - 1, 12 if sub else 14, TEXT_COLOR)
+        else:
+            self.text(f"{marker} {text}", indent, width, "Helvetica", size, 14 if sub else 16, TEXT_COLOR)
+
+
+def layout_roadmap(roadmap: Roadmap, options: Optional[PdfOptions] = None, generated_at: Optional[str] = None) -> PdfLayout:
+    """
+    Lay out a roadmap into pages of positioned text and line operations.
+
+    The layout does not touch a canvas, so it can be measured, cached or
+    drawn more than once.
+    """
+    options = options or PdfOptions()
+    generated_at = generated_at or datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+    layout = _Layout(options)
+
+    layout.text("Your Personalized Learning Roadmap", LEFT_MARGIN, layout.content_width, "Helvetica-Bold", 28, 24, PRIMARY_COLOR)
+    layout.y -= 0.3 * inch
+    layout.text(f"Generated on {generated_at}", LEFT_MARGIN, layout.content_width, "Helvetica", 12, 16, TEXT_COLOR)
+    layout.y -= 0.4 * inch
+
+    current_phase = None
+    for section in roadmap.sections:
+        if section.phase and section.phase != current_phase:
+            layout.ensure_space(2 * inch)
+            layout.section_header(clean_text(section.phase), is_phase=True)
+        current_phase = section.phase
+        if section.title:
+            layout.ensure_space(2 * inch)
+            layout.section_header(clean_text(section.title), is_phase=False)
+        for entry in section.entries:
+            layout.ensure_space(1.5 * inch)
+            if entry.kind == "item":
+                layout.item(clean_text(entry.text + (f" - {', '.join(entry.tags)}" if entry.tags else "")), sub=entry.level > 0)
+            else:
+                layout.text(clean_text(entry.text), LEFT_MARGIN, layout.content_width, "Helvetica", 11, 14, TEXT_COLOR)
+
+    return PdfLayout(layout.pages, (layout.width, layout.height), options, generated_at)
+
+
+def _draw_header(c, width: float, height: float, options: PdfOptions) -> None:
+    logo = logo_image() if options.logo else None
+    if logo is not None:
+        c.drawImage(logo, LEFT_MARGIN, height - 0.7 * inch, width=1.5 * inch, height=LOGO_SIZE,
+                    preserveAspectRatio=True, mask="auto")
+    c.setFont("Helvetica-Bold", 24)
+    c.setFillColor(PRIMARY_COLOR)
+    c.drawString(LEFT_MARGIN + 1.5 * inch + 0.4 * inch, height - 0.6 * inch, options.title)
+    c.setStrokeColor(ACCENT_COLOR)
+    c.setLineWidth(2)
+    c.line(LEFT_MARGIN, height - 0.8 * inch, width - RIGHT_MARGIN, height - 0.8 * inch)
+
+
+def _draw_footer(c, width: float, page_num: int, generated_at: str) -> None:
+    c.setFont("Helvetica", 8)
+    c.setFillColor(TEXT_COLOR)
+    c.drawCentredString(width / 2, BOTTOM_MARGIN + 0.1 * inch, f"Generated by SkillWise | Page {page_num} | {generated_at}")
+    c.setStrokeColor(ACCENT_COLOR)
+    c.setLineWidth(1)
+    c.line(LEFT_MARGIN, BOTTOM_MARGIN + 0.3 * inch, width - RIGHT_MARGIN, BOTTOM_MARGIN + 0.3 * inch)
+
+
+def draw_layout(layout: PdfLayout) -> bytes:
+    """Draw a laid-out roadmap and return the PDF bytes."""
+    width, height = layout.page_size
+    buffer = BytesIO()
+    c = canvas.Canvas(buffer, pagesize=layout.page_size)
+    # The header is identical on every page: draw it once and reuse it as a form
+    c.beginForm("page_header")
+    _draw_header(c, width, height, layout.options)
+    c.endForm()
+    for page_num, ops in enumerate(layout.pages, start=1):
+        c.doForm("page_header")
+        for op in ops:
+            if op[0] == "text":
+                _, font_name, font_size, color, x, y, text = op
+                c.setFont(font_name, font_size)
+                c.setFillColor(color)
+                c.drawString(x, y, text)
+            else:
+                _, color, line_width, x1, y1, x2, y2 = op
+                c.setStrokeColor(color)
+                c.setLineWidth(line_width)
+                c.line(x1, y1, x2, y2)
+        _draw_footer(c, width, page_num, layout.generated_at)
+        c.showPage()
+    c.save()
+    return buffer.getvalue()
+
+
+def render_pdf(roadmap: Union[Roadmap, str], options: Optional[PdfOptions] = None, generated_at: Optional[str] = None) -> bytes:
+    """Render a roadmap (model or markdown text) to PDF bytes, without caching."""
+    if isinstance(roadmap, str):
+        roadmap = get_roadmap(roadmap)
+    return draw_layout(layout_roadmap(roadmap, options, generated_at))
+
+
+def pdf_cache_key(roadmap: Roadmap, options: Optional[PdfOptions] = None, generated_at: str = "") -> str:
+    return make_key(PDF_RENDERER_VERSION, roadmap.digest, (options or PdfOptions())._asdict(), generated_at)
+
+
+def export_pdf(roadmap: Union[Roadmap, str], options: Optional[PdfOptions] = None, use_cache: bool = True) -> bytes:
+    """
+    Render a roadmap to PDF, reusing the cached PDF for the same roadmap
+    content and options. Cached PDFs are stamped with the date only, and the
+    date is part of the cache key, so a cached PDF never shows a stale
+    "Generated on" line.
+
+    Args:
+        roadmap (Roadmap or str): Roadmap model or markdown text
+        options (PdfOptions, optional): Page size, logo and title
+        use_cache (bool): Look up and store the result in the PDF cache
+
+    Returns:
+        bytes: The PDF document
+    """
+    if isinstance(roadmap, str):
+        roadmap = get_roadmap(roadmap)
+    if not use_cache:
+        return render_pdf(roadmap, options)
+    generated_at = datetime.now().strftime("%Y-%m-%d")
+    cache = get_cache("pdf", default_ttl=PDF_CACHE_TTL)
+    key = pdf_cache_key(roadmap, options, generated_at)
+    cached = cache.get(key)
+    if cached:
+        return base64.b64decode(cached)
+    pdf_bytes = render_pdf(roadmap, options, generated_at)
+    try:
+        cache.set(key, base64.b64encode(pdf_bytes).decode("ascii"))
+    except OSError:
+        pass
+    return pdf_bytes
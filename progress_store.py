@@ -0,0 +1,186 @@
+# progress_store.py
+import os
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, Mapping, Optional, Tuple
+
+PROGRESS_DB = os.getenv("SKILLWISE_PROGRESS_DB", "progress.db")
+# Progress of superseded roadmaps is kept this long before garbage collection
+PROGRESS_RETENTION = float(os.getenv("SKILLWISE_PROGRESS_RETENTION", 30 * 24 * 3600))
+BUSY_TIMEOUT_MS = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS roadmaps (
+    user_id TEXT NOT NULL,
+    roadmap_id TEXT NOT NULL,
+    activated_at REAL NOT NULL,
+    superseded_at REAL,
+    PRIMARY KEY (user_id, roadmap_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS roadmaps_superseded ON roadmaps (superseded_at);
+CREATE TABLE IF NOT EXISTS progress (
+    user_id TEXT NOT NULL,
+    roadmap_id TEXT NOT NULL,
+    item_id TEXT NOT NULL,
+    completed INTEGER NOT NULL,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (user_id, roadmap_id, item_id)
+) WITHOUT ROWID;
+"""
+
+_UPSERT = """
+INSERT INTO progress (user_id, roadmap_id, item_id, completed, updated_at) VALUES (?, ?, ?, ?, ?)
+ON CONFLICT (user_id, roadmap_id, item_id) DO UPDATE SET completed = excluded.completed, updated_at = excluded.updated_at
+"""
+
+
+class ProgressStore:
+    """
+    Per-user roadmap progress in SQLite.
+
+    Each checklist item is one row keyed by (user, roadmap, item), so a toggle
+    is a single-row upsert and concurrent sessions never overwrite each other.
+    The database runs in WAL mode so readers do not block the writer, and
+    connections are kept per thread.
+
+    When a user switches to a new roadmap (including an edited version of the
+    same one), progress for items whose ids still exist is carried over and
+    the previous roadmap is marked superseded; its rows are removed by ``gc``
+    once they are older than the retention period.
+    """
+
+    def __init__(self, path: str = PROGRESS_DB, retention: float = PROGRESS_RETENTION):
+        self.path = path
+        self.retention = retention
+        self._local = threading.local()
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        self._connect().executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(f"PRAGMA busy_timeout={BUSY_TIMEOUT_MS}")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def load(self, user_id: str, roadmap_id: str) -> Dict[str, bool]:
+        """Return ``{item_id: completed}`` for one user's roadmap."""
+        rows = self._connect().execute(
+            "SELECT item_id, completed FROM progress WHERE user_id = ? AND roadmap_id = ?",
+            (user_id, roadmap_id),
+        )
+        return {item_id: bool(completed) for item_id, completed in rows}
+
+    def set_item(self, user_id: str, roadmap_id: str, item_id: str, completed: bool) -> None:
+        """Record one item's state (a single-row upsert)."""
+        with self._transaction() as conn:
+            conn.execute(_UPSERT, (user_id, roadmap_id, item_id, int(completed), time.time()))
+
+    def set_items(self, user_id: str, roadmap_id: str, items: Mapping[str, bool]) -> None:
+        """Record several items' states in one transaction."""
+        now = time.time()
+        with self._transaction() as conn:
+            conn.executemany(_UPSERT, [(user_id, roadmap_id, item_id, int(done), now) for item_id, done in items.items()])
+
+    def activate(self, user_id: str, roadmap_id: str, item_ids: Optional[Iterable[str]] = None) -> Dict[str, bool]:
+        """
+        Make ``roadmap_id`` the user's current roadmap and return its progress.
+
+        Progress from the previously active roadmap is copied for items that
+        are still present (all items when ``item_ids`` is None), and the
+        previous roadmap is marked superseded.
+        """
+        now = time.time()
+        with self._transaction() as conn:
+            previous = [
+                row[0] for row in conn.execute(
+                    "SELECT roadmap_id FROM roadmaps WHERE user_id = ? AND superseded_at IS NULL AND roadmap_id != ?",
+                    (user_id, roadmap_id),
+                )
+            ]
+            conn.execute(
+                "INSERT INTO roadmaps (user_id, roadmap_id, activated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (user_id, roadmap_id) DO UPDATE SET activated_at = excluded.activated_at, superseded_at = NULL",
+                (user_id, roadmap_id, now),
+            )
+            if previous:
+                wanted = None if item_ids is None else set(item_ids)
+                carried = [
+                    (user_id, roadmap_id, item_id, completed, now)
+                    for old_id in previous
+                    for item_id, completed in conn.execute(
+                        "SELECT item_id, completed FROM progress WHERE user_id = ? AND roadmap_id = ?",
+                        (user_id, old_id),
+                    ).fetchall()
+                    if wanted is None or item_id in wanted
+                ]
+                conn.executemany(
+                    "INSERT OR IGNORE INTO progress (user_id, roadmap_id, item_id, completed, updated_at) VALUES (?, ?, ?, ?, ?)",
+                    carried,
+                )
+                conn.executemany(
+                    "UPDATE roadmaps SET superseded_at = ? WHERE user_id = ? AND roadmap_id = ?",
+                    [(now, user_id, old_id) for old_id in previous],
+                )
+        return self.load(user_id, roadmap_id)
+
+    def gc(self, older_than: Optional[float] = None) -> Tuple[int, int]:
+        """
+        Delete roadmaps superseded more than ``older_than`` seconds ago
+        (default: the retention period) together with their progress.
+
+        Returns:
+            tuple: (roadmaps removed, progress rows removed)
+        """
+        cutoff = time.time() - (self.retention if older_than is None else older_than)
+        with self._transaction() as conn:
+            items = conn.execute(
+                "DELETE FROM progress WHERE (user_id, roadmap_id) IN "
+                "(SELECT user_id, roadmap_id FROM roadmaps WHERE superseded_at IS NOT NULL AND superseded_at < ?)",
+                (cutoff,),
+            ).rowcount
+            roadmaps = conn.execute(
+                "DELETE FROM roadmaps WHERE superseded_at IS NOT NULL AND superseded_at < ?", (cutoff,)
+            ).rowcount
+        return roadmaps, items
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+_stores: Dict[str, ProgressStore] = {}
+_lock = threading.Lock()
+
+
+def get_progress_store(path: Optional[str] = None) -> ProgressStore:
+    """
+    Return the process-wide store for ``path`` (default: SKILLWISE_PROGRESS_DB).
+    Expired superseded roadmaps are collected when the store is first opened.
+    """
+    path = path or PROGRESS_DB
+    with _lock:
+        if path not in _stores:
+            store = ProgressStore(path)
+            store.gc()
+            _stores[path] = store
+        return _stores[path]
@@ -0,0 +1,56 @@
+# provision_nltk.py
+"""
+Prefetch NLTK data into the project data directory and refresh the
+pre-serialized stopword list, so goal analysis never downloads at runtime.
+
+    python provision_nltk.py           # download punkt/stopwords, write data/stopwords_english.txt
+    python provision_nltk.py --check   # report readiness without touching the network
+"""
+import argparse
+import os
+import sys
+
+from goal_analyzer import NLTK_DATA_DIR, STOPWORDS_FILE, is_ready, nltk_readiness
+
+RESOURCES = ["punkt", "punkt_tab", "stopwords"]
+
+
+def provision(data_dir: str = NLTK_DATA_DIR) -> None:
+    """Download the NLTK resources and write the stopword file."""
+    import nltk
+
+    os.makedirs(data_dir, exist_ok=True)
+    for resource in RESOURCES:
+        # punkt_tab only exists for newer NLTK releases; a failure there is fine
+        if not nltk.download(resource, download_dir=data_dir, quiet=True) and resource != "punkt_tab":
+            raise SystemExit(f"Failed to download NLTK resource '{resource}'")
+
+    if data_dir not in nltk.data.path:
+        nltk.data.path.insert(0, data_dir)
+    from nltk.corpus import stopwords
+
+    os.makedirs(os.path.dirname(STOPWORDS_FILE), exist_ok=True)
+    with open(STOPWORDS_FILE, "w", encoding="utf-8") as f:
+        f.write("\n".join(sorted(set(stopwords.words("english")))) + "\n")
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Provision NLTK data for SkillWise.")
+    parser.add_argument("--check", action="store_true", help="only report readiness; never downloads")
+    parser.add_argument("--data-dir", default=NLTK_DATA_DIR, help="NLTK data directory")
+    args = parser.parse_args(argv)
+
+    if not args.check:
+        provision(args.data_dir)
+
+    status = nltk_readiness(args.data_dir)
+    status["stopwords_file"] = os.path.exists(STOPWORDS_FILE)
+    for name, ok in status.items():
+        print(f"{name:15} {'ok' if ok else 'missing'}")
+    ready = is_ready(data_dir=args.data_dir)
+    print(f"goal analysis ready (offline): {'yes' if ready else 'no'}")
+    return 0 if ready else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
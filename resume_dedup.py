@@ -0,0 +1,187 @@
+# resume_dedup.py
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, NamedTuple, Optional
+
+import numpy as np
+
+DEDUP_INDEX = os.getenv("SKILLWISE_DEDUP_INDEX", "resume_index.db")
+# Estimated Jaccard similarity above which two resumes count as near-duplicates
+DUPLICATE_THRESHOLD = float(os.getenv("SKILLWISE_DEDUP_THRESHOLD", "0.85"))
+SHINGLE_SIZE = 5  # Words per shingle
+NUM_PERM = 128
+LSH_BANDS = 16  # 16 bands x 8 rows: pairs above ~0.7 similarity become candidates
+BUSY_TIMEOUT_MS = 5000
+
+_MERSENNE_PRIME = (1 << 31) - 1
+_MAX_HASH = (1 << 31) - 1
+_TOKEN = re.compile(r"[a-z0-9+#]+")
+# Fixed seed: signatures must be comparable across processes and runs
+_rng = np.random.RandomState(1)
+_PERM_A = _rng.randint(1, _MERSENNE_PRIME, size=NUM_PERM, dtype=np.uint64)
+_PERM_B = _rng.randint(0, _MERSENNE_PRIME, size=NUM_PERM, dtype=np.uint64)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS resumes (
+    id TEXT PRIMARY KEY,
+    signature BLOB NOT NULL,
+    payload TEXT NOT NULL,
+    created_at REAL NOT NULL
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS lsh_buckets (
+    band INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    resume_id TEXT NOT NULL,
+    PRIMARY KEY (band, bucket, resume_id)
+) WITHOUT ROWID;
+"""
+
+
+class DuplicateMatch(NamedTuple):
+    id: str
+    similarity: float
+    payload: dict
+
+
+def shingles(text: str, size: int = SHINGLE_SIZE) -> set:
+    """Word ``size``-shingles of ``text`` with case, punctuation and spacing normalized."""
+    tokens = _TOKEN.findall((text or "").lower())
+    if len(tokens) < size:
+        return {" ".join(tokens)} if tokens else set()
+    return {" ".join(tokens[i:i + size]) for i in range(len(tokens) - size + 1)}
+
+
+def minhash(text: str) -> np.ndarray:
+    """NUM_PERM-value MinHash signature of the text's shingles."""
+    hashes = np.fromiter(
+        (zlib.crc32(shingle.encode("utf-8")) & _MAX_HASH for shingle in shingles(text)), dtype=np.uint64
+    )
+    if hashes.size == 0:
+        return np.full(NUM_PERM, _MAX_HASH, dtype=np.uint32)
+    permuted = (np.outer(_PERM_A, hashes) + _PERM_B[:, None]) % _MERSENNE_PRIME
+    return permuted.min(axis=1).astype(np.uint32)
+
+
+def similarity(a: np.ndarray, b: np.ndarray) -> float:
+    """Estimated Jaccard similarity of two signatures."""
+    return float(np.count_nonzero(a == b)) / len(a)
+
+
+def _band_buckets(signature: np.ndarray) -> List[int]:
+    rows = NUM_PERM // LSH_BANDS
+    return [
+        int.from_bytes(hashlib.blake2b(signature[band * rows:(band + 1) * rows].tobytes(), digest_size=7).digest(), "big")
+        for band in range(LSH_BANDS)
+    ]
+
+
+class ResumeIndex:
+    """
+    Persistent MinHash/LSH index of processed resumes.
+
+    Each resume is reduced to a MinHash signature over word shingles. The
+    signature is split into LSH_BANDS bands, and each band is hashed to a
+    bucket stored in SQLite. A lookup only compares against resumes that
+    share a bucket, so its cost depends on the number of near-duplicates,
+    not on the size of the index. Candidates are confirmed by estimated
+    similarity. Each resume carries a JSON payload, for example the roadmap
+    it produced, so callers can reuse results for near-duplicates.
+    """
+
+    def __init__(self, path: str = DEDUP_INDEX, threshold: float = DUPLICATE_THRESHOLD):
+        self.path = path
+        self.threshold = threshold
+        self._local = threading.local()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._connect().executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def add(self, resume_id: str, text_or_signature, payload: Optional[dict] = None) -> np.ndarray:
+        """Index a resume (text or precomputed signature) under ``resume_id``, replacing any previous entry."""
+        signature = minhash(text_or_signature) if isinstance(text_or_signature, str) else text_or_signature
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM lsh_buckets WHERE resume_id = ?", (resume_id,))
+            conn.execute(
+                "INSERT OR REPLACE INTO resumes (id, signature, payload, created_at) VALUES (?, ?, ?, ?)",
+                (resume_id, signature.tobytes(), json.dumps(payload or {}), time.time()),
+            )
+            conn.executemany(
+                "INSERT OR IGNORE INTO lsh_buckets (band, bucket, resume_id) VALUES (?, ?, ?)",
+                [(band, bucket, resume_id) for band, bucket in enumerate(_band_buckets(signature))],
+            )
+        return signature
+
+    def query(self, text_or_signature, threshold: Optional[float] = None, limit: int = 5,
+              accept: Optional[Callable[[DuplicateMatch], bool]] = None) -> List[DuplicateMatch]:
+        """
+        Indexed resumes at least ``threshold`` similar, most similar first.
+        With ``accept``, only matches it returns true for are kept, before
+        ``limit`` is applied.
+        """
+        threshold = self.threshold if threshold is None else threshold
+        signature = minhash(text_or_signature) if isinstance(text_or_signature, str) else text_or_signature
+        conn = self._connect()
+        candidates = set()
+        for band, bucket in enumerate(_band_buckets(signature)):
+            candidates.update(row[0] for row in conn.execute(
+                "SELECT resume_id FROM lsh_buckets WHERE band = ? AND bucket = ?", (band, bucket)
+            ))
+        matches = []
+        for resume_id in candidates:
+            row = conn.execute("SELECT signature, payload FROM resumes WHERE id = ?", (resume_id,)).fetchone()
+            if row is None:
+                continue
+            score = similarity(signature, np.frombuffer(row[0], dtype=np.uint32))
+            if score >= threshold:
+                match = DuplicateMatch(resume_id, score, json.loads(row[1]))
+                if accept is None or accept(match):
+                    matches.append(match)
+        matches.sort(key=lambda match: -match.similarity)
+        return matches[:limit]
+
+    def remove(self, resume_id: str) -> None:
+        with self._transaction() as conn:
+            conn.execute("DELETE FROM lsh_buckets WHERE resume_id = ?", (resume_id,))
+            conn.execute("DELETE FROM resumes WHERE id = ?", (resume_id,))
+
+    def __len__(self) -> int:
+        return self._connect().execute("SELECT COUNT(*) FROM resumes").fetchone()[0]
+
+
+_indexes: Dict[str, ResumeIndex] = {}
+_lock = threading.Lock()
+
+
+def get_resume_index(path: Optional[str] = None) -> ResumeIndex:
+    """Return the process-wide index for ``path`` (default: SKILLWISE_DEDUP_INDEX)."""
+    path = path or DEDUP_INDEX
+    with _lock:
+        if path not in _indexes:
+            _indexes[path] = ResumeIndex(path)
+        return _indexes[path]
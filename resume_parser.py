@@ -3,77 +3,358 @@ from PIL import Image
 import pytesseract
 import os
 import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+from disk_cache import get_cache, make_key
+from resume_sections import segment_document
 
-def is_valid_pdf(file_path):
-    """Check if file is a valid PDF."""
-    try:
-        # Fallback: Check file extension and try to open with PyMuPDF
-        if not file_path.lower().endswith('.pdf'):
-            return False
-        try:
-            doc = fitz.open(file_path)
-            doc.close()
-            return True
-        except:
-            return False
-    except Exception:
-        return False
+# Settings that influence extraction output; part of the cache key
+PARSER_VERSION = 5
+OCR_DPI = 300
+# "adaptive": grayscale rendering at a per-page DPI; "fixed": RGB at OCR_DPI
+OCR_MODE = os.getenv("SKILLWISE_OCR_MODE", "adaptive")
+OCR_MIN_DPI = 150
+OCR_MAX_DPI = 300
+OCR_BASE_DPI = 200
+# Upper bound on rendered pixels per page (~10 MB as 8-bit grayscale)
+OCR_MAX_PIXELS = 10_000_000
+# Re-OCR at OCR_MAX_DPI when mean word confidence falls below this; 0 disables
+OCR_RETRY_CONFIDENCE = float(os.getenv("SKILLWISE_OCR_RETRY_CONFIDENCE", "60"))
+# Pages whose text layer is shorter than this are treated as image-only
+MIN_PAGE_TEXT_LENGTH = 20
+# Below this much text-layer text in total, every page read is OCR'd
+MIN_DOCUMENT_TEXT_LENGTH = 100
 
-def extract_text_from_pdf(pdf_path):
-    """Extract text from PDF using PyMuPDF."""
-    text = ""
-    try:
-        doc = fitz.open(pdf_path)
-        for page in doc:
-            text += page.get_text()
-        doc.close()
-        return text
-    except Exception as e:
-        raise Exception(f"Failed to extract text from PDF: {str(e)}")
+# Ingestion limits, checked before any parsing work starts
+MAX_UPLOAD_BYTES = int(os.getenv("SKILLWISE_MAX_UPLOAD_BYTES", 10 * 1024 * 1024))
+MAX_PAGES = int(os.getenv("SKILLWISE_MAX_PAGES", "200"))
+# Opt-in cap: stop extracting once this much text is collected; 0 means no
+# limit. Results report ``truncated`` when the cap cut the text short
+MAX_TEXT_CHARS = int(os.getenv("SKILLWISE_MAX_TEXT_CHARS", "0"))
 
-def extract_text_with_ocr(pdf_path):
-    """Extract text from PDF using OCR."""
-    text = ""
-    try:
-        doc = fitz.open(pdf_path)
-        for page_num in range(len(doc)):
-            page = doc.load_page(page_num)
-            pix = page.get_pixmap(dpi=300)
-            img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
-            text += pytesseract.image_to_string(img)
-        doc.close()
-        return text
-    except Exception as e:
-        raise Exception(f"Failed to perform OCR: {str(e)}")
+# Parallel OCR: worker processes and the cap on pages rendered at once
+OCR_WORKERS = int(os.getenv("SKILLWISE_OCR_WORKERS", "1"))
+OCR_MAX_IN_FLIGHT = int(os.getenv("SKILLWISE_OCR_MAX_IN_FLIGHT", "0")) or None
 
-def parse_resume(pdf_path):
-    """Parse resume with improved error handling and validation."""
-    if not os.path.exists(pdf_path):
-        raise FileNotFoundError(f"Resume file not found: {pdf_path}")
+def open_pdf(source):
+    """Open a PDF from a file path or from in-memory bytes."""
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        return fitz.open(stream=bytes(source), filetype="pdf")
+    return fitz.open(source)
+
+def choose_ocr_dpi(page):
+    """
+    Pick a rendering DPI for OCR from the page size and text density.
+    
+    Scanned pages are rendered at roughly the native resolution of their
+    largest embedded image, since rendering above it adds no detail. Small
+    fonts in a partial text layer raise the DPI. The result is clamped to
+    [OCR_MIN_DPI, OCR_MAX_DPI] and capped so the pixmap stays under
+    OCR_MAX_PIXELS.
+    """
+    rect = page.rect
+    area_sq_in = max((rect.width / 72) * (rect.height / 72), 1e-6)
+    dpi = OCR_BASE_DPI
+    
+    # Degenerate boxes and zero-size spans carry no resolution information
+    images = [
+        info for info in page.get_image_info()
+        if info["bbox"][2] > info["bbox"][0] and info["bbox"][3] > info["bbox"][1] and info["width"] > 0
+    ]
+    if images:
+        largest = max(images, key=lambda info: (info["bbox"][2] - info["bbox"][0]) * (info["bbox"][3] - info["bbox"][1]))
+        bbox_width_in = (largest["bbox"][2] - largest["bbox"][0]) / 72
+        dpi = largest["width"] / bbox_width_in
+    
+    sizes = [
+        span["size"]
+        for block in page.get_text("dict")["blocks"]
+        for line in block.get("lines", [])
+        for span in line["spans"]
+        if span["text"].strip() and span["size"] > 0
+    ]
+    if sizes:
+        # Keep small glyphs at roughly the pixel height of 10pt text at the base DPI
+        dpi = max(dpi, OCR_BASE_DPI * 10 / min(sizes))
+    
+    dpi = min(max(dpi, OCR_MIN_DPI), OCR_MAX_DPI)
+    dpi = min(dpi, (OCR_MAX_PIXELS / area_sq_in) ** 0.5)
+    return int(dpi)
+
+def _ocr_grayscale(page, dpi):
+    """OCR a page rendered as 8-bit grayscale; returns (text, mean confidence)."""
+    pix = page.get_pixmap(dpi=dpi, colorspace=fitz.csGRAY, alpha=False)
+    samples = getattr(pix, "samples_mv", None) or pix.samples
+    # frombuffer wraps the pixmap memory instead of copying it like frombytes
+    img = Image.frombuffer("L", (pix.width, pix.height), samples, "raw", "L", pix.stride, 1)
+    data = pytesseract.image_to_data(img, output_type=pytesseract.Output.DICT)
+    del img, pix
+    
+    lines = {}
+    confidences = []
+    for i, word in enumerate(data["text"]):
+        confidence = float(data["conf"][i])
+        if confidence < 0 or not word.strip():
+            continue
+        confidences.append(confidence)
+        line_key = (data["block_num"][i], data["par_num"][i], data["line_num"][i])
+        lines.setdefault(line_key, []).append(word)
+    
+    text = "\n".join(" ".join(words) for words in lines.values())
+    confidence = sum(confidences) / len(confidences) if confidences else 0.0
+    return (text + "\n" if text else ""), confidence
+
+def _ocr_page(page):
+    """Render a single page and run Tesseract on it."""
+    if OCR_MODE != "adaptive":
+        pix = page.get_pixmap(dpi=OCR_DPI)
+        img = Image.frombytes("RGB", [pix.width, pix.height], pix.samples)
+        return pytesseract.image_to_string(img)
+    
+    dpi = choose_ocr_dpi(page)
+    text, confidence = _ocr_grayscale(page, dpi)
+    if confidence < OCR_RETRY_CONFIDENCE and dpi < OCR_MAX_DPI:
+        retry_text, retry_confidence = _ocr_grayscale(page, OCR_MAX_DPI)
+        if retry_confidence > confidence:
+            text = retry_text
+    return text
+
+# Document handle opened once per OCR worker process
+_worker_doc = None
+
+def _init_ocr_worker(source):
+    global _worker_doc
+    _worker_doc = open_pdf(source)
+
+def _ocr_worker_page(page_num):
+    return page_num, _ocr_page(_worker_doc.load_page(page_num))
+
+def ocr_pages_parallel(source, page_numbers, workers, max_in_flight=None):
+    """
+    OCR the given pages of a PDF (path or bytes) across a process pool.
+    
+    At most ``max_in_flight`` pages (default: two per worker) are submitted at
+    once, so only that many rendered pixmaps exist at any time.
+    
+    Returns:
+        dict: page number -> OCR text
+    """
+    page_numbers = list(page_numbers)
+    max_in_flight = max_in_flight or workers * 2
+    results = {}
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_ocr_worker, initargs=(source,)) as pool:
+        pending = set()
+        for page_num in page_numbers:
+            pending.add(pool.submit(_ocr_worker_page, page_num))
+            if len(pending) >= max_in_flight:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    page, text = future.result()
+                    results[page] = text
+        for future in wait(pending).done:
+            page, text = future.result()
+            results[page] = text
+    return results
+
+def _ocr_selected_pages(doc, source, page_numbers, workers, max_in_flight=None):
+    """OCR only ``page_numbers`` of an open document; returns page number -> text."""
+    page_numbers = list(page_numbers)
+    if workers <= 1 or len(page_numbers) < 2:
+        return {page_num: _ocr_page(doc.load_page(page_num)) for page_num in page_numbers}
+    return ocr_pages_parallel(source, page_numbers, min(workers, len(page_numbers)), max_in_flight or OCR_MAX_IN_FLIGHT)
+
+def needs_ocr(page, text):
+    """
+    Return True if a page has no usable text layer but does contain images or
+    vector drawings (text converted to outlines has no text layer or images).
+    """
+    return len(text.strip()) < MIN_PAGE_TEXT_LENGTH and bool(page.get_images() or page.get_drawings())
+
+def _extract_selective(doc, source, workers=None, max_in_flight=None, max_chars=None, sections=False):
+    """
+    Selective extraction from an already open document.
+    
+    Scanning stops once ``max_chars`` of text-layer text has been collected;
+    later pages are neither read nor OCR'd. With ``sections`` the result also
+    holds the layout-based section split from ``segment_document``.
+    """
+    workers = OCR_WORKERS if workers is None else workers
+    page_texts = []
+    ocr_pages = []
+    total_chars = 0
+    truncated = False
+    for page in doc:
+        if max_chars and total_chars >= max_chars:
+            truncated = True
+            break
+        page_text = page.get_text()
+        page_texts.append(page_text)
+        if needs_ocr(page, page_text):
+            ocr_pages.append(page.number)
+        else:
+            total_chars += len(page_text)
+    if not truncated and len("".join(page_texts).strip()) < MIN_DOCUMENT_TEXT_LENGTH:
+        # Almost no text layer anywhere: OCR everything rather than trust the per-page checks
+        ocr_pages = list(range(len(page_texts)))
+    
+    ocr_seconds = 0.0
+    ocr_texts = {}
+    if ocr_pages:
+        start = time.perf_counter()
+        ocr_texts = _ocr_selected_pages(doc, source, ocr_pages, workers, max_in_flight)
+        for page_num, page_text in ocr_texts.items():
+            page_texts[page_num] = page_text
+        ocr_seconds = time.perf_counter() - start
     
-    if not is_valid_pdf(pdf_path):
+    text = "".join(page_texts)
+    if max_chars and len(text) > max_chars:
+        text = text[:max_chars]
+        truncated = True
+    result = {
+        "text": text,
+        "page_count": len(doc),
+        "pages_read": len(page_texts),
+        "truncated": truncated,
+        "ocr_pages": ocr_pages,
+        "ocr_seconds": round(ocr_seconds, 3),
+    }
+    if sections:
+        result["sections"] = segment_document(doc, page_texts=ocr_texts, max_pages=len(page_texts)).to_dict()
+    return result
+
+def _cache_key(pdf_bytes, max_chars=None, sections=False):
+    """Cache key for a PDF: content hash plus the extractor/OCR settings."""
+    settings = {
+        "max_chars": max_chars,
+        "sections": sections,
+        "version": PARSER_VERSION,
+        "ocr_mode": OCR_MODE,
+        "ocr_dpi": [OCR_DPI, OCR_MIN_DPI, OCR_BASE_DPI, OCR_MAX_DPI, OCR_MAX_PIXELS],
+        "ocr_retry_confidence": OCR_RETRY_CONFIDENCE,
+        "min_page_text_length": MIN_PAGE_TEXT_LENGTH,
+        "min_document_text_length": MIN_DOCUMENT_TEXT_LENGTH,
+        "tesseract_config": "",
+    }
+    return make_key(pdf_bytes, settings)
+
+def resume_cache_stats():
+    """Return hit/miss counters and disk usage of the parsed-resume cache."""
+    return get_cache("resumes").stats()
+
+def _read_upload(data, max_bytes):
+    """Return upload bytes, rejecting oversized input before reading it all."""
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data)
+    else:
+        size = getattr(data, "size", None)
+        if size is not None and size > max_bytes:
+            raise ValueError(f"Resume exceeds the {max_bytes // (1024 * 1024)} MB upload limit")
+        if hasattr(data, "seek"):
+            data.seek(0)
+        data = data.read(max_bytes + 1)
+    if len(data) > max_bytes:
+        raise ValueError(f"Resume exceeds the {max_bytes // (1024 * 1024)} MB upload limit")
+    return data
+
+def ingest_resume(data, use_cache=True, max_bytes=None, max_pages=None, max_chars=None, sections=False):
+    """
+    Parse a resume held in memory, without touching the filesystem.
+    
+    The document is opened once with ``fitz.open(stream=...)``, validated, and
+    text is extracted from the same handle. Size and page-count caps are
+    enforced before any extraction or OCR work starts.
+    
+    Args:
+        data (bytes | file-like): PDF bytes or a readable binary stream
+        use_cache (bool): Look up and store results in the parsed-resume cache
+        max_bytes (int): Upload size cap (default: MAX_UPLOAD_BYTES)
+        max_pages (int): Page-count cap (default: MAX_PAGES)
+        max_chars (int): Stop extracting after this much text (default:
+            MAX_TEXT_CHARS, off unless configured)
+        sections (bool): Also split the resume into sections (Skills,
+            Experience, ...) from PyMuPDF block and font data
+        
+    Returns:
+        dict: ``text``, ``page_count``, ``pages_read``, ``truncated``,
+        ``ocr_pages`` (0-based page numbers that were OCR'd), ``ocr_seconds``
+        and ``cached`` (True when served from the cache, with ``ocr_seconds`` 0)
+    """
+    max_bytes = MAX_UPLOAD_BYTES if max_bytes is None else max_bytes
+    max_pages = MAX_PAGES if max_pages is None else max_pages
+    max_chars = MAX_TEXT_CHARS if max_chars is None else max_chars
+    
+    pdf_bytes = _read_upload(data, max_bytes)
+    if b"%PDF-" not in pdf_bytes[:1024]:
+        raise ValueError("Invalid PDF file format")
+    
+    cache_key = None
+    if use_cache:
+        cache_key = _cache_key(pdf_bytes, max_chars, sections)
+        cached = get_cache("resumes").get(cache_key)
+        if cached is not None:
+            # No OCR ran for this call; the stored time belongs to the first parse
+            return dict(cached, ocr_seconds=0.0, cached=True)
+    
+    try:
+        doc = open_pdf(pdf_bytes)
+    except Exception:
         raise ValueError("Invalid PDF file format")
     
     try:
-        # First attempt: Direct text extraction
-        text = extract_text_from_pdf(pdf_path)
+        if doc.needs_pass:
+            raise ValueError("Password-protected PDFs are not supported")
+        if len(doc) == 0:
+            raise ValueError("Invalid PDF file format")
+        if len(doc) > max_pages:
+            raise ValueError(f"Resume has {len(doc)} pages; the limit is {max_pages}")
         
-        # If text extraction yields insufficient content, try OCR
-        if len(text.strip()) < 100:
-            text = extract_text_with_ocr(pdf_path)
-            
-        # Validate extracted text
-        if not text.strip():
-            raise ValueError("No text could be extracted from the resume")
+        try:
+            # Keep the text layer where it exists and OCR only image-only pages
+            result = _extract_selective(doc, pdf_bytes, max_chars=max_chars, sections=sections)
             
-        return text.strip()
-        
-    except Exception as e:
-        raise Exception(f"Failed to parse resume: {str(e)}")
+            # Validate extracted text
+            if not result["text"].strip():
+                raise ValueError("No text could be extracted from the resume")
+        except Exception as e:
+            raise Exception(f"Failed to parse resume: {str(e)}")
     finally:
-        # Cleanup if file was created in temp directory
-        if os.path.dirname(pdf_path) == tempfile.gettempdir():
-            try:
-                os.remove(pdf_path)
-            except:
-                pass
\ No newline at end of file
+        doc.close()
+    
+    result["text"] = result["text"].strip()
+    result["cached"] = False
+    if cache_key is not None:
+        try:
+            get_cache("resumes").set(cache_key, result)
+        except OSError:
+            pass  # Caching is best-effort
+    return result
+
+def parse_resume_detailed(pdf_path, use_cache=True):
+    """
+    Parse a resume file and report how it was extracted.
+    
+    Returns:
+        dict: ``text`` plus the page/OCR report from ``ingest_resume``
+    """
+    if not os.path.exists(pdf_path):
+        raise FileNotFoundError(f"Resume file not found: {pdf_path}")
+    
+    try:
+        if not pdf_path.lower().endswith('.pdf'):
+            raise ValueError("Invalid PDF file format")
+        with open(pdf_path, "rb") as f:
+            return ingest_resume(f, use_cache=use_cache)
+    finally:
+        _cleanup_temp(pdf_path)
+
+def parse_resume(pdf_path, use_cache=True):
+    """Parse resume with improved error handling and validation."""
+    return parse_resume_detailed(pdf_path, use_cache=use_cache)["text"]
+
+def _cleanup_temp(pdf_path):
+    """Cleanup if file was created in temp directory."""
+    if os.path.dirname(pdf_path) == tempfile.gettempdir():
+        try:
+            os.remove(pdf_path)
+        except:
+            pass
@@ -0,0 +1,191 @@
+# resume_sections.py
+import re
+from statistics import median
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# Canonical section name -> headings that introduce it
+SECTION_ALIASES = {
+    "summary": ["summary", "profile", "objective", "about me", "professional summary", "career objective", "career summary"],
+    "skills": ["skills", "technical skills", "key skills", "core competencies", "competencies", "technologies", "tech stack", "tools", "skills and tools", "technical proficiency"],
+    "experience": ["experience", "work experience", "professional experience", "employment", "employment history", "work history", "internships", "internship experience"],
+    "education": ["education", "academic background", "academics", "qualifications", "educational qualifications"],
+    "projects": ["projects", "personal projects", "academic projects", "key projects", "selected projects"],
+    "certifications": ["certifications", "certificates", "licenses and certifications", "courses", "training"],
+    "achievements": ["achievements", "awards", "honors", "honors and awards", "accomplishments"],
+}
+
+# Text before the first heading (name, contact details)
+HEADER_SECTION = "header"
+# Separates a section from a sub-heading nested in it, e.g. "skills/cloud and devops"
+SUBSECTION_SEPARATOR = "/"
+
+_HEADING_LOOKUP = {alias: name for name, aliases in SECTION_ALIASES.items() for alias in aliases}
+_HEADING_NOISE = re.compile(r"[^a-z ]+")
+_MAX_HEADING_LENGTH = 40
+
+
+def classify_heading(line: str) -> Optional[str]:
+    """Return the canonical section name if ``line`` is a known resume heading."""
+    if len(line) > _MAX_HEADING_LENGTH:
+        return None
+    normalized = " ".join(_HEADING_NOISE.sub(" ", line.lower().replace("&", " and ")).split())
+    return _HEADING_LOOKUP.get(normalized)
+
+
+def top_section(name: str) -> str:
+    """Known section a (possibly nested) section name belongs to."""
+    return name.split(SUBSECTION_SEPARATOR, 1)[0]
+
+
+class ResumeSections:
+    """
+    Resume text split into named sections, in document order. Sub-headings
+    inside a known section are kept as ``<section>/<sub-heading>`` entries
+    and are included whenever their section is asked for.
+    """
+
+    def __init__(self, sections: Dict[str, str]):
+        self._sections = {name: text.strip() for name, text in sections.items() if text.strip()}
+
+    def __contains__(self, name: str) -> bool:
+        return any(top_section(section) == name for section in self._sections)
+
+    def __iter__(self):
+        return iter(self._sections)
+
+    def __repr__(self) -> str:
+        sizes = ", ".join(f"{name}={len(text)}" for name, text in self._sections.items())
+        return f"ResumeSections({sizes})"
+
+    def get(self, name: str, default: str = "") -> str:
+        """Return the text of section ``name``, including its sub-sections."""
+        return self.text_for(name) if name in self else default
+
+    def text_for(self, *names: str) -> str:
+        """Return the text of the given sections (and their sub-sections) joined in document order."""
+        wanted = set(names)
+        return "\n".join(text for name, text in self._sections.items() if top_section(name) in wanted)
+
+    @property
+    def skills(self) -> str:
+        return self.get("skills")
+
+    @property
+    def experience(self) -> str:
+        return self.get("experience")
+
+    @property
+    def education(self) -> str:
+        return self.get("education")
+
+    @property
+    def projects(self) -> str:
+        return self.get("projects")
+
+    def to_dict(self) -> Dict[str, str]:
+        return dict(self._sections)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, str]) -> "ResumeSections":
+        return cls(data or {})
+
+
+def _page_lines(page) -> Iterable[Tuple[str, float]]:
+    """Yield ``(text, font_size)`` for each text line of a PyMuPDF page."""
+    for block in page.get_text("dict", sort=True)["blocks"]:
+        for line in block.get("lines", []):
+            spans = [span for span in line["spans"] if span["text"].strip()]
+            if not spans:
+                continue
+            text = " ".join("".join(span["text"] for span in spans).split())
+            yield text, max(span["size"] for span in spans)
+
+
+class _Segmenter:
+    def __init__(self):
+        self.sections: Dict[str, List[str]] = {}
+        self.current = HEADER_SECTION
+        self.seen_heading = False
+
+    def start(self, name: str) -> None:
+        self.current = name
+        self.seen_heading = True
+        self.sections.setdefault(name, [])
+
+    def start_sub(self, heading: str) -> None:
+        """Open a sub-section of the current known section."""
+        self.current = top_section(self.current) + SUBSECTION_SEPARATOR + heading
+        self.sections.setdefault(self.current, [])
+
+    def add(self, line: str) -> None:
+        self.sections.setdefault(self.current, []).append(line)
+
+    def result(self) -> ResumeSections:
+        return ResumeSections({name: "\n".join(lines) for name, lines in self.sections.items()})
+
+
+def segment_text(text: str) -> ResumeSections:
+    """Split plain text (e.g. OCR output) into sections using known headings only."""
+    segmenter = _Segmenter()
+    _segment_plain(segmenter, text)
+    return segmenter.result()
+
+
+def _segment_plain(segmenter: _Segmenter, text: str) -> None:
+    for line in text.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        name = classify_heading(line)
+        if name:
+            segmenter.start(name)
+        else:
+            segmenter.add(line)
+
+
+def segment_document(doc, page_texts: Optional[Dict[int, str]] = None, max_pages: Optional[int] = None) -> ResumeSections:
+    """
+    Split a PyMuPDF document into resume sections using block and font data.
+
+    A line starts a new section when it matches a known heading. Once the
+    first known heading has been seen, a short line set in a clearly larger
+    font than the body text starts a sub-section of the current section
+    (e.g. "Programming Languages" under Skills). Pages listed in ``page_texts``
+    (typically OCR'd pages without a text layer) are segmented from that
+    plain text instead.
+    """
+    page_texts = page_texts or {}
+    pages = []
+    for page in doc:
+        if max_pages is not None and page.number >= max_pages:
+            break
+        if page.number in page_texts:
+            pages.append(page_texts[page.number])
+        else:
+            pages.append(list(_page_lines(page)))
+
+    styled = [line for lines in pages if isinstance(lines, list) for line in lines]
+    body_size = median(size for _, size in styled) if styled else 0.0
+
+    segmenter = _Segmenter()
+    for lines in pages:
+        if isinstance(lines, str):
+            _segment_plain(segmenter, lines)
+            continue
+        for text, size in lines:
+            name = classify_heading(text)
+            if name:
+                segmenter.start(name)
+            elif (
+                segmenter.seen_heading
+                and len(text) <= _MAX_HEADING_LENGTH
+                and size >= body_size + 1.5
+            ):
+                heading = " ".join(_HEADING_NOISE.sub(" ", text.lower().replace("&", " and ")).split())
+                if heading:
+                    segmenter.start_sub(heading)
+                else:
+                    segmenter.add(text)
+            else:
+                segmenter.add(text)
+    return segmenter.result()
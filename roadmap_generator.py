@@ -1,8 +1,16 @@
 # roadmap_generator.py
-import google.generativeai as genai
+import hashlib
 import os
 import time
-from typing import Optional
+from typing import Iterator, Optional
+from disk_cache import get_cache, make_key
+from gemini_client import DEFAULT_MODEL, GeminiError, backoff_delay, generate_async, model_chain, run_sync, stream_text
+from goal_analyzer import extract_goal_keywords
+
+MODEL_NAME = DEFAULT_MODEL
+# Bump whenever build_roadmap_prompt changes so cached roadmaps are not reused
+PROMPT_TEMPLATE_VERSION = 1
+ROADMAP_CACHE_TTL = float(os.getenv("SKILLWISE_ROADMAP_CACHE_TTL", 7 * 24 * 3600))
 
 class RoadmapGenerationError(Exception):
     """Custom exception for roadmap generation errors."""
@@ -18,41 +26,150 @@ def validate_prompt(prompt: str) -> bool:
         return False
     return True
 
-def generate_roadmap(prompt: str, max_retries: int = 3) -> str:
+def build_roadmap_prompt(role: str, goal: str) -> str:
+    """Build the roadmap generation prompt for a role and career goal."""
+    return (
+        f"Create a personalized learning roadmap to help the user achieve their career goal of becoming a {role} "
+        f"with the specific aspiration: '{goal}'. "
+        f"Based on the role of {role}, identify the key skills and knowledge areas required, "
+        f"and focus on bridging the gaps between the user's current skills and the role's requirements. "
+        f"Provide a step-by-step roadmap with actionable learning steps, including specific resources (e.g., courses, tutorials) "
+        f"and tag each resource with relevant labels (e.g., 'YouTube', 'Beginner-Friendly', 'Coursera') in the format: "
+        f"'* <step> - <tag1>, <tag2>'. Ensure the roadmap is practical and tailored to the user's goal and role."
+    )
+
+def resume_fingerprint(resume_text: str) -> str:
+    """Hash of the resume text with case and whitespace normalized."""
+    normalized = " ".join((resume_text or "").lower().split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+def roadmap_cache_key(role: str, goal: str, resume_text: str, model_name: str = MODEL_NAME) -> str:
+    """Cache key from the model, prompt version, role, goal keywords and resume."""
+    try:
+        goal_keywords = extract_goal_keywords(goal) if goal and goal.strip() else []
+    except Exception:
+        goal_keywords = [" ".join(goal.lower().split())]
+    return make_key(
+        model_name,
+        PROMPT_TEMPLATE_VERSION,
+        " ".join(role.lower().split()),
+        goal_keywords,
+        resume_fingerprint(resume_text),
+    )
+
+def get_cached_roadmap(cache_key: str) -> Optional[str]:
+    """Return a cached roadmap for ``cache_key``, or None."""
+    return get_cache("roadmaps", default_ttl=ROADMAP_CACHE_TTL).get(cache_key)
+
+def cache_roadmap(cache_key: str, roadmap: str, model_name: Optional[str] = None) -> None:
+    """
+    Store a generated roadmap; failures to write are ignored. ``model_name`` is
+    the model that produced it: output of a fallback model is not cached under
+    the primary model's key, so the next request tries the primary again.
+    """
+    if model_name not in (None, MODEL_NAME):
+        return
+    try:
+        get_cache("roadmaps", default_ttl=ROADMAP_CACHE_TTL).set(cache_key, roadmap)
+    except OSError:
+        pass
+
+async def generate_roadmap_async(prompt: str, max_retries: int = 3, hedge: Optional[bool] = None, stats: Optional[dict] = None) -> str:
+    """
+    Generate a learning roadmap without blocking the calling event loop.
+    
+    Requests share the pooled, rate-limited client in ``gemini_client``;
+    non-retryable failures (invalid key, blocked prompt, daily quota) are
+    not retried. Retries move down the fallback model chain, and ``hedge``
+    enables hedged requests to cut tail latency. ``stats``, if given, gets
+    the ``model`` that served the roadmap.
+    
+    Raises:
+        RoadmapGenerationError: If generation fails
+    """
+    if not validate_prompt(prompt):
+        raise RoadmapGenerationError("Invalid prompt. Please provide a detailed prompt between 50 and 4000 characters.")
+    
+    try:
+        text = await generate_async(prompt, model_name=MODEL_NAME, max_retries=max_retries, hedge=hedge, stats=stats)
+    except GeminiError as e:
+        raise RoadmapGenerationError(f"Failed to generate roadmap after {max_retries} attempts. Last error: {str(e)}")
+    return text.strip()
+
+def generate_roadmap(prompt: str, max_retries: int = 3, hedge: Optional[bool] = None, stats: Optional[dict] = None) -> str:
     """
     Generate a learning roadmap using Google's Gemini model.
     
     Args:
         prompt (str): The prompt for roadmap generation
         max_retries (int): Maximum number of retry attempts
+        hedge (bool, optional): Issue a hedged second request when the first
+            is slow (default: SKILLWISE_GEMINI_HEDGE)
+        stats (dict, optional): Filled in with the ``model`` that served it
         
     Returns:
         str: Generated roadmap text
         
+    Raises:
+        RoadmapGenerationError: If generation fails after retries
+    """
+    return run_sync(generate_roadmap_async(prompt, max_retries=max_retries, hedge=hedge, stats=stats))
+
+def generate_roadmap_stream(prompt: str, max_retries: int = 3, stats: Optional[dict] = None) -> Iterator[str]:
+    """
+    Generate a learning roadmap, yielding text chunks as the model produces them.
+    
+    Retryable failures before the first chunk are retried with jittered
+    backoff, moving down the fallback model chain. Once text has been
+    yielded it cannot be taken back, so a failure mid-stream raises
+    immediately.
+    
+    Args:
+        prompt (str): The prompt for roadmap generation
+        max_retries (int): Maximum number of retry attempts
+        stats (dict, optional): Filled in with ``ttft`` (seconds to first
+            chunk), ``total_time``, ``attempts`` and the ``model`` used
+        
+    Yields:
+        str: Generated roadmap text chunks
+        
     Raises:
         RoadmapGenerationError: If generation fails after retries
     """
     if not validate_prompt(prompt):
         raise RoadmapGenerationError("Invalid prompt. Please provide a detailed prompt between 50 and 4000 characters.")
     
-    retry_count = 0
+    stats = stats if stats is not None else {}
+    start_time = time.perf_counter()
     last_error = None
+    chain = model_chain(MODEL_NAME)
     
-    while retry_count < max_retries:
+    for attempt in range(max_retries):
+        stats["attempts"] = attempt + 1
+        model_name = chain[min(attempt, len(chain) - 1)]
+        stats["model"] = model_name
+        yielded = False
         try:
-            model = genai.GenerativeModel("gemini-1.5-flash")
-            response = model.generate_content(prompt)
+            for text in stream_text(prompt, model_name=model_name):
+                if not yielded:
+                    stats["ttft"] = time.perf_counter() - start_time
+                    yielded = True
+                yield text
+            
+            if not yielded:
+                raise GeminiError("Empty response from model", retryable=True)
             
-            if not response or not response.text:
-                raise RoadmapGenerationError("Empty response from model")
-                
-            return response.text.strip()
+            stats["total_time"] = time.perf_counter() - start_time
+            return
             
-        except Exception as e:
-            last_error = str(e)
-            retry_count += 1
-            if retry_count < max_retries:
-                time.sleep(2 ** retry_count)  # Exponential backoff
-            continue
-    
-    raise RoadmapGenerationError(f"Failed to generate roadmap after {max_retries} attempts. Last error: {last_error}")
\ No newline at end of file
+        except GeminiError as e:
+            if yielded:
+                raise RoadmapGenerationError(f"Roadmap stream interrupted: {str(e)}")
+            last_error = e
+            next_model = chain[min(attempt + 1, len(chain) - 1)]
+            if attempt + 1 >= max_retries or not (e.retryable or (e.quota and next_model != model_name)):
+                break
+            if next_model == model_name:
+                time.sleep(backoff_delay(attempt + 1, e.retry_after))
+    
+    raise RoadmapGenerationError(f"Failed to generate roadmap after {stats['attempts']} attempts. Last error: {last_error}")
@@ -0,0 +1,246 @@
+# roadmap_model.py
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+# Parsed roadmaps kept in memory, keyed by content digest
+PARSE_CACHE_SIZE = 32
+
+_PHASE_HEADING = re.compile(r"^(#{1,2})\s+(.+)$")
+_SECTION_HEADING = re.compile(r"^#{3,6}\s+(.+)$")
+_BULLET = re.compile(r"^(\s*)([*\-+•◦▪]|\d+[.)])\s+(.+)$")
+# Trailing "- <tag1>, <tag2>" as requested by the roadmap prompt
+_TAG_SUFFIX = re.compile(r"\s[-–—]\s(?!.*\s[-–—]\s)([^:]+)$")
+_MAX_TAGS = 6
+_MAX_TAG_WORDS = 3
+
+
+class RoadmapEntry(NamedTuple):
+    """A line of a section: a trackable item, or a note shown as-is."""
+    id: str
+    kind: str  # "item" or "note"
+    text: str
+    tags: Tuple[str, ...]
+    level: int  # 0 for bullets, 1 for sub-bullets
+    line: int
+
+
+class RoadmapSection(NamedTuple):
+    id: str
+    title: str
+    phase: str
+    start: int  # first source line (the heading, if any)
+    end: int  # one past the last source line
+    entries: Tuple[RoadmapEntry, ...]
+
+    @property
+    def items(self) -> List[RoadmapEntry]:
+        return [entry for entry in self.entries if entry.kind == "item"]
+
+
+class RoadmapPhase(NamedTuple):
+    title: str
+    sections: Tuple[RoadmapSection, ...]
+
+
+def roadmap_digest(text: str) -> str:
+    """Content hash identifying a roadmap text."""
+    return hashlib.sha256((text or "").strip().encode("utf-8")).hexdigest()
+
+
+def _stable_id(*parts: str) -> str:
+    normalized = "\x1f".join(" ".join(part.lower().split()) for part in parts)
+    return hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:12]
+
+
+def _strip_emphasis(text: str) -> str:
+    return text.strip().strip("*_`").strip().rstrip(":").strip()
+
+
+def split_tags(text: str) -> Tuple[str, Tuple[str, ...]]:
+    """Split a trailing ``" - tag1, tag2"`` off an item's text."""
+    found = _TAG_SUFFIX.search(text)
+    if not found:
+        return text, ()
+    tags = [_strip_emphasis(tag) for tag in found.group(1).split(",")]
+    if not tags or len(tags) > _MAX_TAGS or any(not tag or len(tag.split()) > _MAX_TAG_WORDS or "." in tag for tag in tags):
+        return text, ()
+    return text[:found.start()].rstrip(), tuple(tags)
+
+
+class Roadmap:
+    """
+    Structured view of a roadmap: phases, sections and their items/notes.
+
+    Markdown roadmaps are parsed with one set of rules shared by the progress
+    tracker, the section editors, the exports and Q&A:
+
+    - ``#``/``##`` headings start a phase
+    - ``###`` headings and lines starting with ``**`` start a section
+    - bullets (``*``, ``-``, ``•``, numbered) are items; indented bullets and
+      ``◦`` are sub-items
+    - anything else is a note
+
+    Item ids are derived from the item text and section ids from their titles,
+    so they stay the same when other parts of the roadmap change.
+    """
+
+    def __init__(self, text: str):
+        self.text = (text or "").strip()
+        self.digest = roadmap_digest(self.text)
+        self.lines = self.text.splitlines()
+        self.phases: Tuple[RoadmapPhase, ...] = self._parse()
+        self._sections = {section.id: section for phase in self.phases for section in phase.sections}
+
+    def _parse(self) -> Tuple[RoadmapPhase, ...]:
+        phases: List[RoadmapPhase] = []
+        phase_title = ""
+        sections: List[RoadmapSection] = []
+        section: Optional[dict] = None
+        seen: Dict[str, int] = {}
+
+        def unique_id(*parts: str) -> str:
+            base = _stable_id(*parts)
+            count = seen.get(base, 0)
+            seen[base] = count + 1
+            return base if not count else _stable_id(*parts, str(count))
+
+        def close_section(end: int) -> None:
+            nonlocal section
+            if section and (section["title"] or section["entries"]):
+                sections.append(RoadmapSection(
+                    section["id"], section["title"], phase_title, section["start"], end, tuple(section["entries"])
+                ))
+            section = None
+
+        def close_phase(end: int) -> None:
+            nonlocal sections
+            close_section(end)
+            if phase_title or sections:
+                phases.append(RoadmapPhase(phase_title, tuple(sections)))
+            sections = []
+
+        def open_section(title: str, start: int) -> dict:
+            return {"id": unique_id(phase_title, title), "title": title, "start": start, "entries": []}
+
+        for index, raw in enumerate(self.lines):
+            line = raw.strip()
+            if not line:
+                continue
+            phase_match = _PHASE_HEADING.match(line)
+            if phase_match:
+                close_phase(index)
+                phase_title = _strip_emphasis(phase_match.group(2))
+                continue
+            section_match = _SECTION_HEADING.match(line)
+            if section_match or (line.startswith("**") and not _BULLET.match(raw)):
+                close_section(index)
+                title = section_match.group(1) if section_match else line.replace("**", "")
+                section = open_section(_strip_emphasis(title), index)
+                continue
+
+            if section is None:
+                section = open_section("", index)
+            bullet = _BULLET.match(raw)
+            if bullet:
+                indent, marker, body = bullet.groups()
+                level = 1 if len(indent.expandtabs(4)) >= 2 or marker in "◦▪" else 0
+                body, tags = split_tags(body.strip())
+                # Keyed on the item text alone so renaming or moving a section keeps its items' ids
+                entry_id = unique_id("item", body)
+                section["entries"].append(RoadmapEntry(entry_id, "item", body, tags, level, index))
+            else:
+                section["entries"].append(RoadmapEntry(unique_id(section["id"], line), "note", line, (), 0, index))
+
+        close_phase(len(self.lines))
+        return tuple(phases)
+
+    @property
+    def sections(self) -> List[RoadmapSection]:
+        return [section for phase in self.phases for section in phase.sections]
+
+    def section(self, section_id: str) -> Optional[RoadmapSection]:
+        return self._sections.get(section_id)
+
+    def items(self) -> Iterator[Tuple[RoadmapSection, RoadmapEntry]]:
+        """Yield every trackable item with its section, in document order."""
+        for section in self.sections:
+            for item in section.items:
+                yield section, item
+
+    def item_ids(self) -> List[str]:
+        return [item.id for _, item in self.items()]
+
+    def rename_section(self, section_id: str, title: str) -> str:
+        """Roadmap text with the section's heading replaced by ``title``."""
+        section = self._sections[section_id]
+        lines = list(self.lines)
+        heading = f"**{' '.join(title.split())}**"
+        if section.title:
+            lines[section.start] = heading
+        else:
+            lines.insert(section.start, heading)
+        return "\n".join(lines)
+
+    def replace_section(self, section_id: str, markdown: str) -> str:
+        """Roadmap text with the whole section (heading and entries) replaced by ``markdown``."""
+        section = self._sections[section_id]
+        return "\n".join(self.lines[:section.start] + markdown.strip().splitlines() + self.lines[section.end:])
+
+    def section_markdown(self, section_id: str) -> str:
+        section = self._sections[section_id]
+        return "\n".join(self.lines[section.start:section.end]).strip()
+
+    def to_dict(self) -> dict:
+        return {
+            "digest": self.digest,
+            "phases": [
+                {
+                    "title": phase.title,
+                    "sections": [
+                        {
+                            "id": section.id,
+                            "title": section.title,
+                            "items": [
+                                {"id": entry.id, "text": entry.text, "tags": list(entry.tags), "level": entry.level}
+                                for entry in section.entries if entry.kind == "item"
+                            ],
+                            "notes": [entry.text for entry in section.entries if entry.kind == "note"],
+                        }
+                        for section in phase.sections
+                    ],
+                }
+                for phase in self.phases
+            ],
+        }
+
+    def __len__(self) -> int:
+        return sum(len(section.items) for section in self.sections)
+
+    def __repr__(self) -> str:
+        return f"Roadmap(digest={self.digest[:12]}, sections={len(self.sections)}, items={len(self)})"
+
+
+_cache: "OrderedDict[str, Roadmap]" = OrderedDict()
+_lock = threading.Lock()
+
+
+def get_roadmap(text: str) -> Roadmap:
+    """
+    Return the parsed roadmap for ``text``, parsing it at most once per
+    content hash (the most recent PARSE_CACHE_SIZE roadmaps are kept).
+    """
+    digest = roadmap_digest(text)
+    with _lock:
+        roadmap = _cache.get(digest)
+        if roadmap is not None:
+            _cache.move_to_end(digest)
+            return roadmap
+    roadmap = Roadmap(text)
+    with _lock:
+        _cache[digest] = roadmap
+        while len(_cache) > PARSE_CACHE_SIZE:
+            _cache.popitem(last=False)
+    return roadmap
@@ -0,0 +1,117 @@
+# role_fit.py
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+import numpy as np
+
+from skill_catalog import SkillCatalog, get_catalog
+
+
+class RoleFitEngine:
+    """
+    Scores resumes against every role in the catalog at once.
+
+    The catalog is precomputed into a dense ``roles x skills`` weight matrix.
+    A resume becomes a 0/1 vector over skills, so scoring it against all
+    roles is one matrix-vector product, and scoring N resumes is one
+    matrix-matrix product. A role's score is the share of its total skill
+    weight covered by the resume (0-1).
+    """
+
+    def __init__(self, catalog: SkillCatalog):
+        self.catalog = catalog
+        self.roles: List[str] = catalog.role_names()
+        self.skills: List[str] = catalog.skill_names()
+        self.skill_index: Dict[str, int] = {skill: i for i, skill in enumerate(self.skills)}
+
+        self.weights = np.zeros((len(self.roles), len(self.skills)), dtype=np.float32)
+        for row, role in enumerate(self.roles):
+            for skill, weight in catalog.role_skills(role):
+                self.weights[row, self.skill_index[skill]] = weight
+        totals = self.weights.sum(axis=1)
+        self._inverse_totals = np.divide(1.0, totals, out=np.zeros_like(totals), where=totals > 0)
+
+    def vectorize(self, matched_skills: Iterable[str]) -> np.ndarray:
+        """0/1 vector over catalog skills for a set of matched skill names."""
+        vector = np.zeros(len(self.skills), dtype=np.float32)
+        indices = [self.skill_index[s] for s in matched_skills if s in self.skill_index]
+        vector[indices] = 1.0
+        return vector
+
+    def vectorize_many(self, matched: Sequence[Iterable[str]]) -> np.ndarray:
+        """``N x skills`` 0/1 matrix for a batch of matched-skill sets."""
+        matrix = np.zeros((len(matched), len(self.skills)), dtype=np.float32)
+        for row, skills in enumerate(matched):
+            indices = [self.skill_index[s] for s in skills if s in self.skill_index]
+            matrix[row, indices] = 1.0
+        return matrix
+
+    def score(self, vector: np.ndarray) -> np.ndarray:
+        """Fit score (0-1) of one skill vector against every role."""
+        return (self.weights @ vector) * self._inverse_totals
+
+    def score_batch(self, matrix: np.ndarray) -> np.ndarray:
+        """``N x roles`` fit scores for a batch of skill vectors."""
+        return (matrix @ self.weights.T) * self._inverse_totals
+
+    def _top_indices(self, scores: np.ndarray, k: int) -> np.ndarray:
+        k = min(k, scores.shape[-1])
+        if k <= 0:
+            return np.empty(scores.shape[:-1] + (0,), dtype=np.intp)
+        top = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+        order = np.argsort(-np.take_along_axis(scores, top, axis=-1), axis=-1, kind="stable")
+        return np.take_along_axis(top, order, axis=-1)
+
+    def _breakdown(self, role_index: int, score: float, matched: Set[str]) -> dict:
+        role = self.roles[role_index]
+        role_skills = self.catalog.role_skills(role)
+        return {
+            "role": role,
+            "score": float(score),
+            "matched": [skill for skill, _ in role_skills if skill in matched],
+            "missing": [{"skill": skill, "weight": weight} for skill, weight in role_skills if skill not in matched],
+        }
+
+    def top_roles(self, matched_skills: Iterable[str], k: int = 5) -> List[dict]:
+        """
+        Best-fit roles for one resume, with per-skill gap breakdowns.
+
+        Returns:
+            list: dicts with ``role``, ``score``, ``matched`` skills and
+            ``missing`` skills (heaviest weight first)
+        """
+        matched = set(matched_skills)
+        scores = self.score(self.vectorize(matched))
+        return [self._breakdown(i, scores[i], matched) for i in self._top_indices(scores, k)]
+
+    def top_roles_batch(self, matched: Sequence[Iterable[str]], k: int = 5, breakdown: bool = False) -> List[List[dict]]:
+        """Best-fit roles for many resumes; gap breakdowns only when requested."""
+        matched = [set(skills) for skills in matched]
+        scores = self.score_batch(self.vectorize_many(matched))
+        top = self._top_indices(scores, k)
+        results = []
+        for row, indices in enumerate(top):
+            if breakdown:
+                results.append([self._breakdown(i, scores[row, i], matched[row]) for i in indices])
+            else:
+                results.append([{"role": self.roles[i], "score": float(scores[row, i])} for i in indices])
+        return results
+
+    def score_resumes(self, texts: Sequence[str], k: int = 5, breakdown: bool = False) -> List[List[dict]]:
+        """Match skills in raw resume texts, then rank roles for each in one batch."""
+        matcher = self.catalog.matcher
+        return self.top_roles_batch([matcher.matched_skills(text) for text in texts], k=k, breakdown=breakdown)
+
+
+_engine: Optional[RoleFitEngine] = None
+_lock = threading.Lock()
+
+
+def get_role_fit_engine(catalog: Optional[SkillCatalog] = None) -> RoleFitEngine:
+    """Return the engine for the current catalog, rebuilding it after a catalog reload."""
+    global _engine
+    catalog = catalog or get_catalog()
+    with _lock:
+        if _engine is None or _engine.catalog is not catalog:
+            _engine = RoleFitEngine(catalog)
+        return _engine
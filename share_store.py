@@ -0,0 +1,163 @@
+# share_store.py
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Tuple
+
+SHARE_DIR = os.getenv("SKILLWISE_SHARE_DIR", "shared_roadmaps")
+# Shares not opened for this long are removed by cleanup
+SHARE_RETENTION = float(os.getenv("SKILLWISE_SHARE_RETENTION", 90 * 24 * 3600))
+# Hex digits of the content digest used as the share id
+SHARE_ID_LENGTH = 20
+BUSY_TIMEOUT_MS = 5000
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS shares (
+    id TEXT PRIMARY KEY,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    size INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS shares_accessed ON shares (accessed_at);
+"""
+
+
+def share_digest(record: dict) -> str:
+    """Stable digest of a share record (canonical JSON, sorted keys)."""
+    canonical = json.dumps(record, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class ShareStore:
+    """
+    Write-once, content-addressed store for shared roadmaps.
+
+    A record's id is a prefix of its content digest, so the same roadmap
+    always gets the same id in every process, and storing it again is a
+    no-op. Records are gzip-compressed under ``<dir>/<id[:2]>/<id[2:4]>/``
+    and written atomically (temp file + rename), so concurrent writers of the
+    same record are harmless. A small SQLite index in WAL mode tracks
+    creation and last-access times for retention cleanup.
+    """
+
+    def __init__(self, directory: str = SHARE_DIR, retention: float = SHARE_RETENTION):
+        self.directory = directory
+        self.retention = retention
+        self._local = threading.local()
+        os.makedirs(directory, exist_ok=True)
+        self._connect().executescript(_SCHEMA)
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(os.path.join(self.directory, "index.db"), timeout=BUSY_TIMEOUT_MS / 1000, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Connection]:
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _path(self, share_id: str) -> str:
+        return os.path.join(self.directory, share_id[:2], share_id[2:4], f"{share_id}.json.gz")
+
+    def put(self, record: dict) -> str:
+        """
+        Store ``record`` unless identical content is already stored.
+
+        Returns:
+            str: The share id
+        """
+        share_id = share_digest(record)[:SHARE_ID_LENGTH]
+        path = self._path(share_id)
+        # Another process's cleanup may have removed a blob this one wrote, so check the file itself
+        if not os.path.exists(path):
+            payload = gzip.compress(json.dumps(dict(record, shared_at=time.time())).encode("utf-8"), mtime=0)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(payload)
+                os.replace(tmp_path, path)
+            except BaseException:
+                if os.path.exists(tmp_path):
+                    os.remove(tmp_path)
+                raise
+            now = time.time()
+            with self._transaction() as conn:
+                conn.execute(
+                    "INSERT OR IGNORE INTO shares (id, created_at, accessed_at, size) VALUES (?, ?, ?, ?)",
+                    (share_id, now, now, len(payload)),
+                )
+        return share_id
+
+    def get(self, share_id: str) -> Optional[dict]:
+        """Return the record for ``share_id``, or None if it does not exist."""
+        if not share_id or not all(c in "0123456789abcdef" for c in share_id):
+            return None
+        try:
+            with open(self._path(share_id), "rb") as f:
+                record = json.loads(gzip.decompress(f.read()).decode("utf-8"))
+        except (OSError, ValueError, EOFError):
+            return None
+        with self._transaction() as conn:
+            conn.execute("UPDATE shares SET accessed_at = ? WHERE id = ?", (time.time(), share_id))
+        return record
+
+    def cleanup(self, older_than: Optional[float] = None) -> Tuple[int, int]:
+        """
+        Remove shares not accessed for ``older_than`` seconds (default: the
+        retention period).
+
+        Returns:
+            tuple: (shares removed, bytes freed)
+        """
+        cutoff = time.time() - (self.retention if older_than is None else older_than)
+        with self._transaction() as conn:
+            expired = conn.execute("SELECT id, size FROM shares WHERE accessed_at < ?", (cutoff,)).fetchall()
+            conn.executemany("DELETE FROM shares WHERE id = ?", [(share_id,) for share_id, _ in expired])
+        freed = 0
+        for share_id, size in expired:
+            try:
+                os.remove(self._path(share_id))
+                freed += size
+            except OSError:
+                pass
+        return len(expired), freed
+
+    def stats(self) -> dict:
+        count, size = self._connect().execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM shares").fetchone()
+        return {"shares": count, "bytes": size}
+
+
+_stores: Dict[str, ShareStore] = {}
+_lock = threading.Lock()
+
+
+def get_share_store(directory: Optional[str] = None) -> ShareStore:
+    """
+    Return the process-wide share store for ``directory`` (default:
+    SKILLWISE_SHARE_DIR). Expired shares are cleaned up when it is first opened.
+    """
+    directory = directory or SHARE_DIR
+    with _lock:
+        if directory not in _stores:
+            store = ShareStore(directory)
+            store.cleanup()
+            _stores[directory] = store
+        return _stores[directory]
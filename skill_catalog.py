@@ -0,0 +1,155 @@
+# skill_catalog.py
+import json
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+from skill_matcher import SkillMatcher
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+CATALOG_PATH = os.getenv("SKILLWISE_CATALOG", os.path.join(BASE_DIR, "data", "catalog.json"))
+# How often (seconds) to check the catalog file for changes
+RELOAD_CHECK_INTERVAL = float(os.getenv("SKILLWISE_CATALOG_RELOAD_INTERVAL", "5"))
+
+
+class CatalogError(Exception):
+    """Raised when the skills/course catalog cannot be loaded."""
+    pass
+
+
+class SkillCatalog:
+    """
+    Indexed view of the role/skill/course catalog.
+
+    Built once from the catalog JSON; every lookup is a dict access, so cost
+    does not grow with the number of roles or skills.
+
+    Catalog format::
+
+        {
+          "version": 1,
+          "default_skills": {"Python": 1.0, ...},
+          "roles": {"AI Engineer": {"skills": {"Python": 1.0, ...}}, ...},
+          "skills": {"Python": {"aliases": ["py"],
+                                "courses": [{"title": "...", "provider": "Coursera"}, ...]}, ...}
+        }
+
+    Skill weights are relative importances for a role; courses are listed
+    best first.
+    """
+
+    def __init__(self, data: dict, source: Optional[str] = None):
+        self.source = source
+        self.version = data.get("version", 1)
+        self._roles: Dict[str, List[Tuple[str, float]]] = {}
+        self._role_keys: Dict[str, str] = {}
+        self._skills: Dict[str, dict] = {}
+        self._skill_keys: Dict[str, str] = {}
+        self._aliases: Dict[str, str] = {}
+
+        for name, entry in data.get("skills", {}).items():
+            self._add_skill(name, entry)
+        for role, entry in data.get("roles", {}).items():
+            self._roles[role] = self._weighted_skills(entry.get("skills", {}))
+            self._role_keys[role.lower()] = role
+        self.default_skills = self._weighted_skills(data.get("default_skills", {}))
+        self.matcher = SkillMatcher(self._skills, aliases=self._aliases)
+
+    def _add_skill(self, name: str, entry: dict) -> None:
+        self._skills[name] = {
+            "aliases": list(entry.get("aliases", [])),
+            "courses": list(entry.get("courses", [])),
+        }
+        self._skill_keys[name.lower()] = name
+        for alias in entry.get("aliases", []):
+            self._aliases[alias] = name
+            self._skill_keys.setdefault(alias.lower(), name)
+
+    def _weighted_skills(self, skills) -> List[Tuple[str, float]]:
+        if isinstance(skills, list):  # Plain lists get equal weights
+            skills = {skill: 1.0 for skill in skills}
+        for skill in skills:
+            if skill not in self._skills:
+                self._add_skill(skill, {})
+        return sorted(((skill, float(weight)) for skill, weight in skills.items()), key=lambda item: -item[1])
+
+    @classmethod
+    def from_file(cls, path: str) -> "SkillCatalog":
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return cls(json.load(f), source=path)
+        except (OSError, ValueError) as e:
+            raise CatalogError(f"Failed to load catalog {path}: {str(e)}")
+
+    def role_names(self) -> List[str]:
+        return list(self._roles)
+
+    def skill_names(self) -> List[str]:
+        return list(self._skills)
+
+    def has_role(self, role: str) -> bool:
+        return role.lower() in self._role_keys
+
+    def role_skills(self, role: str) -> List[Tuple[str, float]]:
+        """(skill, weight) pairs for ``role``, heaviest first; the defaults for unknown roles."""
+        key = self._role_keys.get(role.lower()) if role else None
+        return self._roles[key] if key else self.default_skills
+
+    def canonical_skill(self, name: str) -> Optional[str]:
+        """Resolve a skill name or alias to its catalog name."""
+        return self._skill_keys.get(name.lower())
+
+    def courses(self, skill: str, limit: Optional[int] = None) -> List[dict]:
+        """Courses for ``skill`` (name or alias), best first."""
+        name = self.canonical_skill(skill)
+        courses = self._skills[name]["courses"] if name else []
+        return courses[:limit] if limit else courses
+
+    def aliases(self, skill: str) -> List[str]:
+        name = self.canonical_skill(skill)
+        return list(self._skills[name]["aliases"]) if name else []
+
+
+_catalog: Optional[SkillCatalog] = None
+_catalog_mtime: Optional[float] = None
+_last_check = 0.0
+_lock = threading.Lock()
+
+
+def reload_catalog(path: Optional[str] = None) -> SkillCatalog:
+    """Load the catalog from disk and swap it in for all callers."""
+    global _catalog, _catalog_mtime, _last_check
+    path = path or CATALOG_PATH
+    with _lock:
+        catalog = SkillCatalog.from_file(path)
+        _catalog = catalog
+        _catalog_mtime = os.path.getmtime(path)
+        _last_check = time.monotonic()
+        return catalog
+
+
+def get_catalog() -> SkillCatalog:
+    """
+    Return the process-wide catalog, loading it on first use.
+
+    The catalog file's modification time is checked at most every
+    RELOAD_CHECK_INTERVAL seconds, so edits are picked up without a restart.
+    If a reload fails, the previously loaded catalog stays in use.
+    """
+    global _last_check
+    if _catalog is None:
+        return reload_catalog()
+    now = time.monotonic()
+    if now - _last_check >= RELOAD_CHECK_INTERVAL:
+        _last_check = now
+        try:
+            changed = os.path.getmtime(_catalog.source) != _catalog_mtime
+        except OSError:
+            changed = False
+        if changed:
+            try:
+                return reload_catalog(_catalog.source)
+            except CatalogError:
+                pass
+    return _catalog
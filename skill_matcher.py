@@ -0,0 +1,160 @@
+# skill_matcher.py
+import re
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+# Common spellings and abbreviations -> canonical skill name
+DEFAULT_ALIASES = {
+    "k8s": "Kubernetes",
+    "js": "JavaScript",
+    "ecmascript": "JavaScript",
+    "ts": "TypeScript",
+    "ml": "Machine Learning",
+    "dl": "Deep Learning",
+    "nlp": "NLP",
+    "natural language processing": "NLP",
+    "sklearn": "Scikit-learn",
+    "scikit learn": "Scikit-learn",
+    "tf": "TensorFlow",
+    "golang": "Go",
+    "nodejs": "Node.js",
+    "reactjs": "React",
+    "react.js": "React",
+    "postgres": "PostgreSQL",
+    "amazon web services": "AWS",
+    "google cloud": "GCP",
+    "google cloud platform": "GCP",
+    "microsoft azure": "Azure",
+    "ci cd": "CI/CD",
+    "continuous integration": "CI/CD",
+    "rest api": "REST APIs",
+    "restful apis": "REST APIs",
+    "restful api": "REST APIs",
+    "ux research": "User Research",
+    "pen testing": "Penetration Testing",
+    "pentesting": "Penetration Testing",
+    "ms excel": "Excel",
+}
+
+# Terms this short are matched case-sensitively ("R", "Go", "C#"), since their
+# lowercase forms are ordinary words or letters
+_CASE_SENSITIVE_MAX_LENGTH = 2
+# Characters that continue a skill token, e.g. "Java" must not match in "JavaScript"
+_WORD_CHARS = r"\w+#"
+# Short terms are also continued by "&" ("R&D"), and by "/" or "-" joining them
+# to a lowercase word or a single character ("R-squared", "I/O"); skill lists
+# such as "ML/DL" or "Python/R" still match
+_SHORT_BEFORE = rf"(?<![{_WORD_CHARS}&])(?<![a-z][/\-])(?<!(?<!\w)\w[/\-])"
+_SHORT_AFTER = rf"(?![{_WORD_CHARS}&])(?![/\-][a-z])(?![/\-]\w(?!\w))"
+# Version suffixes on longer terms ("Python3", "Java8", "Python3.11")
+_VERSION_SUFFIX = r"(?:\d+(?:\.\d+)*)?"
+
+
+class SkillMatch(NamedTuple):
+    skill: str
+    start: int
+    end: int
+    text: str
+
+
+def _normalize(term: str) -> str:
+    return " ".join(term.lower().replace("-", " ").split())
+
+
+def _trie_pattern(terms: Iterable[str]) -> str:
+    """
+    Build a regex alternation from a character trie of ``terms``.
+
+    Shared prefixes are factored out, so matching cost at each position
+    depends on the length of the longest term rather than on how many terms
+    there are. Optional suffix groups are greedy, so the longest term wins.
+    """
+    trie: Dict = {}
+    for term in terms:
+        node = trie
+        for char in term:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def emit(node: Dict) -> str:
+        terminal = "" in node
+        branches = []
+        for char in sorted(key for key in node if key):
+            if char == " ":
+                atom = r"[\s\-]+"
+            else:
+                atom = re.escape(char)
+            branches.append(atom + emit(node[char]))
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if terminal:
+            return "(?:" + body + ")?"
+        return body
+
+    return emit(trie)
+
+
+class SkillMatcher:
+    """
+    Finds catalog skills in text in a single pass.
+
+    All skills and aliases are compiled into one trie-shaped regular
+    expression with word-boundary semantics, so "Java" does not match inside
+    "JavaScript" and "R" does not match inside words.
+    """
+
+    def __init__(self, skills: Iterable[str], aliases: Optional[Dict[str, str]] = None):
+        self.skills = sorted(set(skills))
+        aliases = DEFAULT_ALIASES if aliases is None else aliases
+        known = set(self.skills)
+
+        self._lookup: Dict[str, str] = {}
+        self._exact: Dict[str, str] = {}
+        for skill in self.skills:
+            self._add_term(skill, skill)
+        for alias, skill in aliases.items():
+            if skill in known:
+                self._add_term(alias, skill)
+
+        branches = []
+        if self._lookup:
+            branches.append(
+                rf"(?<![{_WORD_CHARS}])(?P<term>(?i:{_trie_pattern(self._lookup)})){_VERSION_SUFFIX}(?![{_WORD_CHARS}])"
+            )
+        if self._exact:
+            branches.append(rf"{_SHORT_BEFORE}(?P<short>{_trie_pattern(self._exact)}){_SHORT_AFTER}")
+        self._pattern = re.compile("|".join(branches)) if branches else None
+
+    def _add_term(self, term: str, skill: str) -> None:
+        term = term.strip()
+        if len(term) <= _CASE_SENSITIVE_MAX_LENGTH:
+            # Short terms match as written (if capitalized) and in upper case
+            if term != term.lower():
+                self._exact.setdefault(term, skill)
+            self._exact.setdefault(term.upper(), skill)
+        else:
+            self._lookup.setdefault(_normalize(term), skill)
+
+    def _resolve(self, text: str) -> Optional[str]:
+        return self._exact.get(text) or self._lookup.get(_normalize(text))
+
+    def find_all(self, text: str) -> List[SkillMatch]:
+        """Return every skill mention in ``text`` with its position."""
+        if not text or self._pattern is None:
+            return []
+        matches = []
+        for found in self._pattern.finditer(text):
+            skill = self._resolve(found.group("term") or found.group("short"))
+            if skill:
+                matches.append(SkillMatch(skill, found.start(), found.end(), found.group()))
+        return matches
+
+    def matched_skills(self, text: str) -> Set[str]:
+        """Return the canonical names of all skills mentioned in ``text``."""
+        return {match.skill for match in self.find_all(text)}
+
+    def match(self, text: str, required: Iterable[str]) -> Tuple[List[str], List[str]]:
+        """Split ``required`` skills into (present, missing), keeping their order."""
+        found = self.matched_skills(text)
+        required = list(required)
+        return [s for s in required if s in found], [s for s in required if s not in found]
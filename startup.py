@@ -0,0 +1,60 @@
+# startup.py
+import importlib
+import os
+import sys
+import threading
+import time
+
+# Approximates process start: this module is the first thing app.py imports
+PROCESS_START = time.perf_counter()
+REPORT_ENABLED = os.getenv("SKILLWISE_STARTUP_REPORT", "0") == "1"
+
+_import_times = {}
+_marks = {}
+_lock = threading.Lock()
+
+
+def timed_import(module_name: str):
+    """
+    Import ``module_name`` and record how long the first import took.
+
+    Use this for heavy dependencies that are only needed by one feature, so
+    their cost is paid when the feature is first used rather than at startup.
+    app.py also imports its own modules through it at startup, so the report
+    covers both. A module's time includes dependencies it imports first.
+    """
+    module = sys.modules.get(module_name)
+    if module is not None:
+        return module
+    start = time.perf_counter()
+    module = importlib.import_module(module_name)
+    with _lock:
+        _import_times.setdefault(module_name, time.perf_counter() - start)
+    return module
+
+
+def mark_once(event: str) -> bool:
+    """Record seconds since process start for the first occurrence of ``event``."""
+    with _lock:
+        if event in _marks:
+            return False
+        _marks[event] = time.perf_counter() - PROCESS_START
+        return True
+
+
+def startup_report() -> dict:
+    """Per-module import times and process milestones, in seconds."""
+    with _lock:
+        return {
+            "imports": dict(sorted(_import_times.items(), key=lambda item: -item[1])),
+            "marks": dict(_marks),
+        }
+
+
+def format_report(report: dict) -> str:
+    lines = ["SkillWise startup report"]
+    for name, seconds in report["marks"].items():
+        lines.append(f"  {name:<32} {seconds * 1000:8.1f} ms since start")
+    for name, seconds in report["imports"].items():
+        lines.append(f"  import {name:<25} {seconds * 1000:8.1f} ms")
+    return "\n".join(lines)